@@ -2,8 +2,74 @@
 Configuration settings for Youtify - YouTube to Spotify Converter
 """
 
+import logging
+import urllib.parse
 import streamlit as st
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Hosts that identify a local development server
+_LOCAL_HOSTS = ('localhost', '127.0.0.1')
+
+# Secrets the app cannot run without, as (section, key) pairs
+_REQUIRED_SECRETS = (
+    ("spotify", "client_id"),
+    ("spotify", "client_secret"),
+    ("youtube", "api_key")
+)
+
+@lru_cache(maxsize=1)
+def _load_secrets() -> Dict[str, Dict[str, Any]]:
+    """Snapshot the Streamlit secrets sections once per process"""
+    return {section: dict(values) for section, values in st.secrets.items() if hasattr(values, 'items')}
+
+def _missing_secrets() -> List[str]:
+    """List the required secrets that are absent or empty"""
+    secrets = _load_secrets()
+    return [
+        f"{section}.{key}" for section, key in _REQUIRED_SECRETS
+        if not secrets.get(section, {}).get(key)
+    ]
+
+def _fallback_redirect_uri() -> str:
+    """Build a localhost redirect URI from the configured server port"""
+    try:
+        import streamlit.config
+        port = streamlit.config.get_option("server.port") or 8501
+    except Exception:
+        port = 8501
+    return f"http://127.0.0.1:{port}/"
+
+@lru_cache(maxsize=1)
+def _resolve_redirect_uri() -> str:
+    """
+    Resolve the Spotify redirect URI once per process
+
+    Local hosts always use the detected 127.0.0.1 URL (matching the Spotify app
+    configuration). Other hosts use the configured redirect_uri when it points
+    at the same domain, otherwise the detected base URL.
+    """
+    try:
+        # For Streamlit >= 1.31.0, we can use st.context.url
+        context_url = st.context.url
+    except Exception as e:
+        logger.debug(f"Redirect URI detection failed: {e}")
+        context_url = None
+
+    if not context_url:
+        return _fallback_redirect_uri()
+
+    parsed_url = urllib.parse.urlparse(context_url)
+    if parsed_url.hostname in _LOCAL_HOSTS:
+        return f"{parsed_url.scheme}://127.0.0.1:{parsed_url.port}/"
+
+    configured_uri = _load_secrets().get("spotify", {}).get("redirect_uri")
+    if configured_uri and urllib.parse.urlparse(configured_uri).hostname == parsed_url.hostname:
+        return configured_uri
+
+    return f"{parsed_url.scheme}://{parsed_url.netloc}/"
 
 class Config:
     """Application configuration using Streamlit secrets"""
@@ -16,93 +82,30 @@ class Config:
     @staticmethod
     def validate_secrets():
         """Validate that all required secrets are present"""
-        required_secrets = [
-            "spotify.client_id",
-            "spotify.client_secret",
-            "youtube.api_key"
-        ]
-
-        missing_secrets = [
-            secret for secret in required_secrets
-            if not st.secrets.get(secret)
-        ]
-
+        missing_secrets = _missing_secrets()
         if missing_secrets:
             st.error(f"Missing required secrets: {', '.join(missing_secrets)}")
             st.stop()
 
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def credentials_configured() -> bool:
+        """Check once whether all required API credentials are present"""
+        return not _missing_secrets()
 
     # Required API Configuration
-    YOUTUBE_API_KEY: str = st.secrets["youtube"]["api_key"]
-    SPOTIFY_CLIENT_ID: str = st.secrets["spotify"]["client_id"]
-    SPOTIFY_CLIENT_SECRET: str = st.secrets["spotify"]["client_secret"]
+    _youtube = _load_secrets()["youtube"]
+    _spotify = _load_secrets()["spotify"]
+    YOUTUBE_API_KEY: str = _youtube["api_key"]
+    SPOTIFY_CLIENT_ID: str = _spotify["client_id"]
+    SPOTIFY_CLIENT_SECRET: str = _spotify["client_secret"]
     
     # Spotify Redirect URI - configurable via secrets or auto-detected
-    # Auto-detect the app's base URL for development environments
-    try:
-        # For Streamlit >= 1.31.0, we can use st.context.url
-        import urllib.parse
-        context_url = st.context.url
-        # Log the context URL for debugging
-        print(f"DEBUG: st.context.url = {context_url}")
-        if context_url:
-            # Get the base URL by removing any path/query parameters
-            parsed_url = urllib.parse.urlparse(context_url)
-            # Use 127.0.0.1 instead of localhost for consistency with Spotify app configuration
-            if parsed_url.hostname in ['localhost', '127.0.0.1']:
-                base_url = f"{parsed_url.scheme}://127.0.0.1:{parsed_url.port}/"
-            else:
-                base_url = f"{parsed_url.scheme}://{parsed_url.netloc}/"
-            
-            # Check if this is a localhost URL (development environment)
-            if parsed_url.hostname in ['localhost', '127.0.0.1']:
-                # Use auto-detected localhost URL for development
-                SPOTIFY_REDIRECT_URI: str = base_url
-                print(f"DEBUG: Using detected localhost URL: {base_url}")
-            else:
-                # For production environments, check if a redirect_uri is configured
-                if "spotify" in st.secrets and "redirect_uri" in st.secrets["spotify"]:
-                    configured_uri = st.secrets["spotify"]["redirect_uri"]
-                    # Validate that the configured URI matches the detected domain
-                    configured_parsed = urllib.parse.urlparse(configured_uri)
-                    if configured_parsed.hostname == parsed_url.hostname:
-                        SPOTIFY_REDIRECT_URI: str = configured_uri
-                        print(f"DEBUG: Using configured production redirect URI: {configured_uri}")
-                    else:
-                        # Fallback to auto-detected URL if configured URI doesn't match
-                        SPOTIFY_REDIRECT_URI: str = base_url
-                        print(f"DEBUG: Configured URI doesn't match domain, using detected URL: {base_url}")
-                else:
-                    # No configured URI, use auto-detected URL
-                    SPOTIFY_REDIRECT_URI: str = base_url
-                    print(f"DEBUG: Using detected production URL: {base_url}")
-        else:
-            # Fallback to localhost for development - use the actual server port
-            try:
-                # Try to get the actual server port from Streamlit config
-                import streamlit.config
-                port = streamlit.config.get_option("server.port") or 8501
-                SPOTIFY_REDIRECT_URI: str = f"http://127.0.0.1:{port}/"
-                print(f"DEBUG: st.context.url is None, using localhost with port {port}")
-            except:
-                # Final fallback to default port
-                SPOTIFY_REDIRECT_URI: str = "http://127.0.0.1:8501/"
-                print("DEBUG: st.context.url is None, using localhost fallback with default port")
-    except Exception as e:
-        # Fallback to localhost for development - use the actual server port
-        try:
-            # Try to get the actual server port from Streamlit config
-            import streamlit.config
-            port = streamlit.config.get_option("server.port") or 8501
-            SPOTIFY_REDIRECT_URI: str = f"http://127.0.0.1:{port}/"
-            print(f"DEBUG: Exception in redirect URI detection: {e}, using localhost with port {port}")
-        except:
-            # Final fallback to default port
-            SPOTIFY_REDIRECT_URI: str = "http://127.0.0.1:8501/"
-            print(f"DEBUG: Exception in redirect URI detection: {e}, using localhost fallback with default port")
+    SPOTIFY_REDIRECT_URI: str = _resolve_redirect_uri()
 
     # Processing Settings
     PROCESSING_DELAY_MS = 100
+    SEARCH_WORKERS = 8
     LOW_CONFIDENCE_THRESHOLD = 0.3
 
 # Streamlit page configuration
@@ -4,13 +4,172 @@ Core Processing Logic - Handles YouTube to Spotify conversion
 
 import re
 import time
-from typing import List, Dict, Callable, Optional
-from fuzzywuzzy import fuzz
+import unicodedata
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, List, Dict, Callable, Optional, Tuple
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
 from utils.youtube_extractor import YouTubeExtractor
 from utils.spotify_manager import SpotifyManager
 from config import Config
 import streamlit as st
 
+logger = logging.getLogger(__name__)
+
+# Report progress after this many completed songs
+_PROGRESS_EVERY = 5
+
+# "Artist - Song" separators (hyphen, en dash, em dash); these win over ":" and "|"
+_DASH_SEPARATORS = (' - ', ' – ', ' — ')
+
+# Artist "Song"
+_QUOTED_TITLE_RE = re.compile(r'^(.+?)\s*"(.+?)"')
+
+# Common suffixes stripped from parsed artist/song names
+_SUFFIX_RE = re.compile(r'\s*(?:\((?:Official|Lyric|Audio)[^)]*\)|\[Official[^\]]*\])', re.IGNORECASE)
+
+# Spotify search sizes: a quick first look, widened only for uncertain matches
+_QUICK_SEARCH_LIMIT = 3
+_FULL_SEARCH_LIMIT = 10
+
+# Artist-less parsed titles that cannot identify a song on their own
+_GARBAGE_TITLE_RE = re.compile(r'^(?:live|audio|official|hd|4k|\d+)$', re.IGNORECASE)
+
+# Fuzzy score (0-100) above which the quick search result is accepted as is
+_CONFIDENT_SCORE = 95
+
+# Title-only searches rank poorly on Spotify, so look at one wider page instead
+_TITLE_ONLY_SEARCH_LIMIT = 20
+
+# Seconds a session's processor is reused; less than the ~1h client-credentials token lifetime
+_PROCESSOR_TTL_S = 3000
+
+# Most entries kept by a processor's title parse and Spotify match caches
+_TITLE_CACHE_SIZE = 2048
+_MATCH_CACHE_SIZE = 2048
+
+# Marks a key missing from a cache, since None is a cached "no match"
+_NOT_CACHED = object()
+
+# Match fields of a result for a video with no Spotify match
+_EMPTY_MATCH = {
+    'spotify_artist': '',
+    'spotify_title': '',
+    'spotify_uri': '',
+    'confidence': 0.0,
+    'spotify_preview_url': '',
+    'album_art_url': ''
+}
+
+def _normalize_match_text(text: str) -> str:
+    """Fold accents, case and punctuation so equivalent names compare equal"""
+    if not text.isascii():
+        # "Beyoncé" -> "Beyonce": decompose and drop the combining marks
+        text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return default_process(text)
+
+def _track_artists(track: Dict) -> str:
+    """Join a Spotify track's artist names for display and matching"""
+    return ", ".join(a['name'] for a in track['artists'])
+
+def _split_artist_song(title: str) -> Optional[Tuple[str, str]]:
+    """Split a stripped "Artist - Song", "Artist: Song" or "Artist | Song" title"""
+    dash_hits = [(i, sep) for sep in _DASH_SEPARATORS for i in (title.find(sep),) if i > 0]
+    if dash_hits:
+        i, sep = min(dash_hits)
+        artist, song = title[:i], title[i + len(sep):]
+    else:
+        other_hits = [i for i in (title.find(':', 1), title.find('|', 1)) if i != -1]
+        if not other_hits:
+            return None
+        i = min(other_hits)
+        artist, song = title[:i], title[i + 1:]
+
+    song = song.strip()
+    if not song:
+        return None
+    return artist.strip(), _strip_trailing_groups(song)
+
+def _strip_trailing_groups(song: str) -> str:
+    """Drop trailing "(...)", "[...]" or "(...) [...]" groups, keeping a non-empty name"""
+    start = 1
+    while True:
+        opens = [i for i in (song.find('(', start), song.find('[', start)) if i != -1]
+        if not opens:
+            return song
+        start = min(opens)
+        if _is_trailing_groups(song[start:]):
+            return song[:start].rstrip()
+        start += 1
+
+def _is_trailing_groups(tail: str) -> bool:
+    """Check whether tail (starting with "(" or "[") consists only of bracketed groups"""
+    if len(tail) < 2:
+        return False
+    if tail[0] == '[':
+        return tail.endswith(']')
+    if tail.endswith(')'):
+        return True
+    if not tail.endswith(']'):
+        return False
+
+    # "(...) [...]": some ")" must be followed by optional whitespace and the "["
+    close = tail.find(')')
+    while close != -1:
+        if tail[close + 1:].lstrip().startswith('['):
+            return True
+        close = tail.find(')', close + 1)
+    return False
+
+def _no_progress(current: int, total: int, message: str):
+    """Progress callback used when the caller does not supply one"""
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at least `interval` seconds apart"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_allowed_at = 0.0
+
+    def wait(self):
+        """Block until the caller's slot is due"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed_at)
+            self._next_allowed_at = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+class _LRUCache:
+    """Thread-safe mapping that evicts the least recently used entry past `maxsize`"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return the cached value for key, marking it as recently used"""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Any, value: Any):
+        """Cache value for key, evicting the oldest entry when full"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
 class PlaylistProcessor:
     """Main processor for converting YouTube playlists to Spotify format"""
 
@@ -24,10 +183,17 @@ class PlaylistProcessor:
         # Initialize Spotify manager (optional - depends on authentication)
         self.spotify_manager = self._get_spotify_manager()
 
+        # Shared across worker threads so concurrent searches respect the delay
+        self.rate_limiter = RateLimiter(Config.PROCESSING_DELAY_MS / 1000.0)
+
+        # Memoized lookups, keyed by raw title and by case-folded (artist, title)
+        self._title_cache = _LRUCache(_TITLE_CACHE_SIZE)
+        self._match_cache = _LRUCache(_MATCH_CACHE_SIZE)
+
     def _validate_credentials(self) -> bool:
         """Validate that required API credentials are available"""
         # Check if we have required credentials
-        if not Config.YOUTUBE_API_KEY or not Config.SPOTIFY_CLIENT_ID or not Config.SPOTIFY_CLIENT_SECRET:
+        if not Config.credentials_configured():
             return False
 
         # Check if user is authenticated
@@ -47,7 +213,6 @@ class PlaylistProcessor:
 
         # Fallback to client credentials for search-only operations
         try:
-            from utils.spotify_manager import SpotifyManager
             spotify_manager = SpotifyManager(
                 Config.SPOTIFY_CLIENT_ID,
                 Config.SPOTIFY_CLIENT_SECRET
@@ -73,6 +238,8 @@ class PlaylistProcessor:
         Returns:
             List of song dictionaries with match results
         """
+        report_progress = progress_callback or _no_progress
+
         try:
             # Extract playlist ID
             playlist_id = self.youtube_extractor.extract_playlist_id(youtube_url)
@@ -81,50 +248,24 @@ class PlaylistProcessor:
 
             # Get videos from playlist with progress tracking
             def youtube_progress(current, total):
-                if progress_callback:
-                    progress_callback(current, total, f"Extracting videos from YouTube... ({current}/{total})")
+                report_progress(current, total, f"Extracting videos from YouTube... ({current}/{total})")
 
             videos = self.youtube_extractor.get_playlist_videos(playlist_id, youtube_progress)
+
             if not videos:
                 raise ValueError("No videos found in playlist or playlist is private")
 
-            results = []
             total_videos = len(videos)
 
-            for i, video in enumerate(videos):
-                # Update progress
-                if progress_callback:
-                    progress_callback(i, total_videos, f"Processing: {video['title']}")
-
-                # Parse song info
-                parsed = self._parse_video_title(video['title'])
-
-                # Search for Spotify match
-                spotify_match = self._find_spotify_match(parsed['artist'], parsed['title'])
-
-                # Create result
-                result = {
-                    'original_title': video['title'],
-                    'channel': video['channel'],
-                    'parsed_artist': parsed['artist'],
-                    'parsed_title': parsed['title'],
-                    'found': spotify_match is not None,
-                    'spotify_artist': spotify_match.get('artist', '') if spotify_match else '',
-                    'spotify_title': spotify_match.get('title', '') if spotify_match else '',
-                    'spotify_uri': spotify_match.get('uri', '') if spotify_match else '',
-                    'confidence': spotify_match.get('confidence', 0.0) if spotify_match else 0.0,
-                    'spotify_preview_url': spotify_match.get('preview_url', '') if spotify_match else '',
-                    'album_art_url': spotify_match.get('album_art_url', '') if spotify_match else ''
-                }
-
-                results.append(result)
-
-                # Small delay for rate limiting
-                time.sleep(Config.PROCESSING_DELAY_MS / 1000.0)
+            def search_progress(completed, index, result):
+                # Update progress every few songs to limit UI reruns
+                if completed % _PROGRESS_EVERY == 0:
+                    report_progress(completed, total_videos, f"Processing: {videos[index]['title']}")
+
+            results = self.match_videos(videos, search_progress)
 
             # Final progress update
-            if progress_callback:
-                progress_callback(total_videos, total_videos, "Processing complete!")
+            report_progress(total_videos, total_videos, "Processing complete!")
 
             return results
 
@@ -133,6 +274,75 @@ class PlaylistProcessor:
             st.error(f"API error occurred: {str(e)}")
             raise ValueError(f"Failed to process playlist: {str(e)}")
 
+    def match_videos(self, videos: List[Dict],
+                     on_result: Optional[Callable[[int, int, Dict], None]] = None) -> List[Dict]:
+        """
+        Search Spotify for every video concurrently and build their results
+
+        Args:
+            videos: Video dictionaries with at least title and channel
+            on_result: Called from the calling thread as each result lands (completed, index, result)
+
+        Returns:
+            Results in playlist order; failed searches count as no match and are reported once
+        """
+        parse_title = self._parse_video_title
+        parsed_titles = [parse_title(video['title']) for video in videos]
+        results = [None] * len(videos)
+        failed_titles = []
+
+        # Spotify searches are I/O-bound, so fan them out; the shared rate
+        # limiter keeps the request rate within the configured budget
+        executor = ThreadPoolExecutor(max_workers=Config.SEARCH_WORKERS)
+        futures = {}
+        try:
+            for i, parsed in enumerate(parsed_titles):
+                futures[executor.submit(self._find_spotify_match, parsed['artist'], parsed['title'])] = i
+
+            for completed, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                try:
+                    spotify_match = future.result()
+                except Exception as e:
+                    logger.warning(f"Spotify search failed for '{videos[i]['title']}': {e}")
+                    failed_titles.append(videos[i]['title'])
+                    spotify_match = None
+
+                results[i] = self._build_result(videos[i], parsed_titles[i], spotify_match)
+                if on_result:
+                    on_result(completed, i, results[i])
+        finally:
+            # A rerun or stop can interrupt the caller mid-loop; drop the queued
+            # searches instead of waiting on results that would be thrown away
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        # Report search failures once rather than per song
+        if failed_titles:
+            st.warning(f"Spotify search failed for {len(failed_titles)} songs: {', '.join(failed_titles)}")
+
+        return results
+
+    def _build_result(self, video: Dict, parsed: Dict[str, str], spotify_match: Optional[Dict]) -> Dict:
+        """Create the result for a video, with empty match fields when nothing was found"""
+        result = {
+            **_EMPTY_MATCH,
+            **(spotify_match or {}),
+            'original_title': video['title'],
+            'channel': video['channel'],
+            'parsed_artist': parsed['artist'],
+            'parsed_title': parsed['title'],
+            'found': bool(spotify_match),
+            'video_id': video.get('video_id', ''),
+            'published': video.get('published', '')
+        }
+
+        if not spotify_match:
+            result['reason'] = ('No match found on Spotify' if self.spotify_manager
+                                else 'Spotify authentication required for matching')
+        return result
+
     def process_playlist_with_data(self, playlist_data: Dict,
                                  progress_callback: Optional[Callable[[int, int, str], None]] = None) -> List[Dict[str, str]]:
         """
@@ -150,50 +360,16 @@ class PlaylistProcessor:
             if not videos:
                 raise ValueError("No songs found in playlist data")
 
-            results = []
             total_videos = len(videos)
+            report_progress = progress_callback or _no_progress
 
-            for i, video in enumerate(videos):
-                # Update progress
-                if progress_callback:
-                    progress_callback(i, total_videos, f"Processing: {video['title']}")
-
-                # Parse song info
-                parsed = self._parse_video_title(video['title'])
-
-                # Search for song on Spotify
-                spotify_result = self._search_spotify(parsed['artist'], parsed['title'])
-
-                # Store result
-                result = {
-                    'youtube_title': video['title'],
-                    'youtube_channel': video['channel'],
-                    'parsed_artist': parsed['artist'],
-                    'parsed_title': parsed['title'],
-                    'found': spotify_result is not None,
-                    'video_id': video.get('video_id', ''),
-                    'published': video.get('published', '')
-                }
-
-                if spotify_result:
-                    result.update({
-                        'spotify_id': spotify_result['id'],
-                        'spotify_uri': spotify_result['uri'],
-                        'spotify_artist': spotify_result['artists'][0]['name'],
-                        'spotify_title': spotify_result['name'],
-                        'confidence': self._calculate_confidence(parsed, spotify_result)
-                    })
-                else:
-                    result['reason'] = 'No match found on Spotify'
-
-                results.append(result)
-
-                # Small delay for rate limiting
-                time.sleep(Config.PROCESSING_DELAY_MS / 1000.0)
+            def search_progress(completed, index, result):
+                report_progress(completed, total_videos, f"Processing: {videos[index]['title']}")
+
+            results = self.match_videos(videos, search_progress)
 
             # Final progress update
-            if progress_callback:
-                progress_callback(total_videos, total_videos, "Processing complete!")
+            report_progress(total_videos, total_videos, "Processing complete!")
 
             return results
 
@@ -203,80 +379,169 @@ class PlaylistProcessor:
             raise ValueError(f"Failed to process playlist: {str(e)}")
 
     def _parse_video_title(self, title: str) -> Dict[str, str]:
-        """Parse video title to extract artist and song name"""
-
-
-        # Common patterns for YouTube music videos (improved to handle hyphenated names)
-        patterns = [
-            # Pattern for "Artist - Song" but avoid splitting on hyphens within words
-            r'^(.+?)\s+[-–—]\s+(.+?)(?:\s*\(.*\))?(?:\s*\[.*\])?$',  # Artist - Song (with spaces around dash)
-            r'^(.+?)\s*[:|]\s*(.+?)(?:\s*\(.*\))?(?:\s*\[.*\])?$',   # Artist : Song
-            r'^(.+?)\s*"(.+?)"',  # Artist "Song"
-            # Fallback: if there's a dash with spaces, split there
-            r'^(.+?)\s+-\s+(.+?)(?:\s*\(.*\))?(?:\s*\[.*\])?$',  # Artist - Song (fallback)
-        ]
-
-        for pattern in patterns:
-            match = re.match(pattern, title.strip())
-            if match:
-                artist = match.group(1).strip()
-                song = match.group(2).strip()
-
-                # Clean up common suffixes
-                for suffix in ['(Official Video)', '(Official Music Video)', '(Lyric Video)',
-                              '(Audio)', '[Official Video]', '[Official Music Video]']:
-                    song = song.replace(suffix, '').strip()
-                    artist = artist.replace(suffix, '').strip()
-
-
-                return {'artist': artist, 'title': song}
-
-        # If no pattern matches, return the title as song name
-
-        return {'artist': '', 'title': title}
+        """Parse video title to extract artist and song name, reusing earlier parses"""
+        parsed = self._title_cache.get(title)
+        if parsed is None:
+            parsed = self._split_video_title(title)
+            self._title_cache.put(title, parsed)
+        return parsed
+
+    @staticmethod
+    def _split_video_title(title: str) -> Dict[str, str]:
+        """Split a video title into artist and song name"""
+        stripped = title.strip()
+
+        # Scan for the separator by hand; only the quoted form needs a regex
+        split = _split_artist_song(stripped)
+        if split:
+            artist, song = split
+        else:
+            match = _QUOTED_TITLE_RE.match(stripped)
+            if not match:
+                # If no pattern matches, return the title as song name
+                return {'artist': '', 'title': title}
+            artist, song = match.group(1), match.group(2)
+
+        return {
+            'artist': _SUFFIX_RE.sub('', artist).strip(),
+            'title': _SUFFIX_RE.sub('', song).strip()
+        }
 
     def _find_spotify_match(self, artist: str, title: str) -> Optional[Dict]:
-        """Find best Spotify match for a song"""
+        """Find best Spotify match for a song (search errors are raised to the caller)"""
         if not self.spotify_manager:
             return None
 
-        try:
-            tracks = self.spotify_manager.search_track(artist, title, limit=10)
-            if not tracks:
-                return None
-
-            # Find best match using fuzzy matching
-            best_match = None
-            best_score = 0.0
-
-            search_string = f"{artist} {title}".lower()
-
-            for track in tracks:
-                track_artists = ", ".join([a['name'] for a in track['artists']])
-                track_string = f"{track_artists} {track['name']}".lower()
+        # Don't spend a rate-limited request on an artist-less title that can't
+        # match anything; with an artist, "Prince - 7" or "Adele - 25" are real songs
+        stripped_title = title.strip()
+        if not artist and (len(stripped_title) < 2 or _GARBAGE_TITLE_RE.match(stripped_title)):
+            return None
 
-                # Calculate similarity score
-                score = fuzz.ratio(search_string, track_string) / 100.0
+        # Playlists often repeat songs; reuse the earlier lookup, including misses.
+        # Failed searches raise before anything is cached, so they are retried next time
+        key = (artist.casefold(), title.casefold())
+        match = self._match_cache.get(key, _NOT_CACHED)
+        if match is _NOT_CACHED:
+            match = self._search_spotify_match(artist, title)
+            self._match_cache.put(key, match)
+        return match
+
+    def _search_spotify_match(self, artist: str, title: str) -> Optional[Dict]:
+        """Search Spotify and pick the best-scoring track; None means no acceptable track, failures raise"""
+        search_string = _normalize_match_text(f"{artist} {title}")
+
+        if not artist:
+            # Without an artist, fetch one wide page and let word-order-insensitive
+            # matching find the title among "Artist Song" candidates
+            self.rate_limiter.wait()
+            tracks = self.spotify_manager.search_track(artist, title, limit=_TITLE_ONLY_SEARCH_LIMIT)
+            best = self._pick_title_only_track(search_string, tracks) if tracks else None
+            return self._track_match(tracks[best[0]], best[1]) if best else None
+
+        # Most songs match within the top few results, so start with a small search
+        self.rate_limiter.wait()
+        tracks = self.spotify_manager.search_track(artist, title, limit=_QUICK_SEARCH_LIMIT)
+        if not tracks:
+            return None
 
-                if score > best_score:
-                    best_score = score
-                    best_match = {
-                        'artist': track_artists,
-                        'title': track['name'],
-                        'uri': track['uri'],
-                        'confidence': score,
-                        'preview_url': track.get('preview_url', ''),
-                        'album_art_url': track['album']['images'][0]['url'] if track['album']['images'] else ''
-                    }
+        best = self._pick_best_track(search_string, tracks)
+        if not best:
+            return None
 
-            # Only return matches above minimum threshold
-            if best_match and best_match['confidence'] >= Config.LOW_CONFIDENCE_THRESHOLD:
-                return best_match
+        # Only widen the search for plausible but uncertain matches
+        if best[1] < _CONFIDENT_SCORE and len(tracks) == _QUICK_SEARCH_LIMIT:
+            self.rate_limiter.wait()
+            wider_tracks = self.spotify_manager.search_track(artist, title, limit=_FULL_SEARCH_LIMIT)
+            wider_best = self._pick_best_track(search_string, wider_tracks) if wider_tracks else None
+            if wider_best and wider_best[1] > best[1]:
+                tracks, best = wider_tracks, wider_best
+
+        index, score = best
+        return self._track_match(tracks[index], score)
+
+    @staticmethod
+    def _track_match(track: Dict, score: float) -> Dict:
+        """Build the result match fields for a chosen Spotify track"""
+        return {
+            'spotify_artist': _track_artists(track),
+            'spotify_title': track['name'],
+            'spotify_uri': track['uri'],
+            'confidence': score / 100.0,
+            'spotify_preview_url': track.get('preview_url', ''),
+            'album_art_url': track['album']['images'][0]['url'] if track['album']['images'] else ''
+        }
+
+    @staticmethod
+    def _pick_best_track(search_string: str, tracks: List[Dict],
+                         scorer: Callable = fuzz.ratio) -> Optional[Tuple[int, float]]:
+        """Return (index, score) of the best track above the confidence threshold"""
+        # Find best match using fuzzy matching, scoring all candidates in one call
+        choices = [
+            _normalize_match_text(f"{_track_artists(track)} {track['name']}")
+            for track in tracks
+        ]
 
+        if search_string in choices:
+            # A candidate matches exactly once normalised, no need for fuzzy scoring
+            return choices.index(search_string), 100.0
+
+        # Only matches above minimum threshold are returned
+        best = process.extractOne(
+            search_string,
+            choices,
+            scorer=scorer,
+            score_cutoff=Config.LOW_CONFIDENCE_THRESHOLD * 100
+        )
+        if not best:
             return None
 
-        except Exception as e:
-            st.warning(f"Spotify search error: {str(e)}")
+        _, score, index = best
+        return index, score
+
+    @staticmethod
+    def _pick_title_only_track(title: str, tracks: List[Dict]) -> Optional[Tuple[int, float]]:
+        """Return (index, score) of the track whose name best matches an artist-less title"""
+        cutoff = Config.LOW_CONFIDENCE_THRESHOLD * 100
+
+        # token_set_ratio scores any "Artist Song" candidate containing the title's
+        # words at 100, so it only shortlists; "Love" would tie with "Love Me Tender"
+        shortlist = process.extract(
+            title,
+            [_normalize_match_text(f"{_track_artists(track)} {track['name']}") for track in tracks],
+            scorer=fuzz.token_set_ratio,
+            score_cutoff=cutoff,
+            limit=None
+        )
+        if not shortlist:
             return None
 
-
+        # Rank the shortlist by the title against the track name alone, which
+        # penalises extra words
+        name_scores = {
+            index: fuzz.ratio(title, _normalize_match_text(tracks[index]['name']))
+            for _, _, index in shortlist
+        }
+        index = max(name_scores, key=name_scores.get)
+        return (index, name_scores[index]) if name_scores[index] >= cutoff else None
+
+
+def get_processor() -> PlaylistProcessor:
+    """Get this session's playlist processor instead of rebuilding it on every rerun"""
+    # Kept per session, never in st.cache_resource: the processor may hold the
+    # session's OAuth-backed Spotify manager, and its match cache and rate limiter
+    # must not be shared between users
+    entry = st.session_state.get('playlist_processor')
+    if entry is not None:
+        processor, built_at = entry
+        # Rebuild before the ~1h client-credentials token expires
+        if time.monotonic() - built_at < _PROCESSOR_TTL_S:
+            return processor
+
+    processor = PlaylistProcessor()
+    if processor.spotify_manager:
+        st.session_state.playlist_processor = (processor, time.monotonic())
+    else:
+        # Don't hold on to a processor whose Spotify authentication failed
+        st.session_state.pop('playlist_processor', None)
+    return processor
@@ -13,9 +13,10 @@ from pathlib import Path
 # Import UI components
 from ui.header import render_header
 from ui.conversion.landing import render_landing_page
+from ui.conversion.preview import _reset_conversion_state
 from ui.processing import render_processing_page
 from ui.playlist.creation import render_playlist_creation_page
-from core.processor import PlaylistProcessor
+from core.processor import get_processor
 from utils.session import initialize_session, get_session_state, set_session_state
 from utils.proper_oauth_manager import ProperOAuthManager
 from config import Config
@@ -30,13 +31,20 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+@st.cache_data(show_spinner=False)
+def _read_css(path: str, mtime: float) -> str:
+    """Read a stylesheet; mtime is part of the cache key so edits are picked up"""
+    with open(path) as f:
+        return f.read()
+
 def load_css():
     """Load custom CSS styling"""
     css_file = Path("styles/main.css")
     if css_file.exists():
-        with open(css_file) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+        css = _read_css(str(css_file), css_file.stat().st_mtime)
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
+@st.cache_data(show_spinner=False)
 def get_logo_base64():
     """Get logo as base64 string"""
     try:
@@ -45,6 +53,11 @@ def get_logo_base64():
     except FileNotFoundError:
         return ""
 
+def _ensure_oauth_manager():
+    """Create the session's OAuth manager once"""
+    if 'oauth_manager' not in st.session_state:
+        st.session_state.oauth_manager = ProperOAuthManager()
+
 def handle_oauth_callback():
     """Handle Spotify OAuth callback if code parameter is present"""
     try:
@@ -56,10 +69,6 @@ def handle_oauth_callback():
             auth_code = query_params['code']
             state_param = query_params.get('state', '')
 
-            # Initialize OAuth manager if not present
-            if 'oauth_manager' not in st.session_state:
-                st.session_state.oauth_manager = ProperOAuthManager()
-
             # Show processing message
             st.info("🔄 Completing Spotify authentication...")
 
@@ -125,13 +134,12 @@ def main():
         st.success("Session state cleared! Please refresh the page.")
         st.stop()
 
+    # Initialize OAuth manager before anything uses it
+    _ensure_oauth_manager()
+
     # Handle OAuth callback first
     handle_oauth_callback()
 
-    # Initialize OAuth manager
-    if 'oauth_manager' not in st.session_state:
-        st.session_state.oauth_manager = ProperOAuthManager()
-
     # Render header with logo
     render_header(get_logo_base64())
 
@@ -146,14 +154,14 @@ def main():
         if youtube_url:
             # User clicked convert - but stay on landing page and handle conversion there
             set_session_state('youtube_url', youtube_url)
-            set_session_state('start_conversion', True)
+            set_session_state('conversion_phase', 'converting')
             st.rerun()
 
 
 
     elif current_state == 'processing':
         # Legacy processing page (kept for compatibility)
-        processor = PlaylistProcessor()
+        processor = get_processor()
         results = render_processing_page(processor)
 
         if results:
@@ -178,7 +186,6 @@ def main():
             col1, col2, col3 = st.columns([1, 2, 1])
             with col2:
                 if st.button("Convert Another"):
-                    from ui.conversion.preview import _reset_conversion_state
                     _reset_conversion_state()
                     st.rerun()
         else:
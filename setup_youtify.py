@@ -6,8 +6,48 @@ Helps users set up the application with proper credentials and configuration.
 
 import os
 import sys
+import shutil
 import subprocess
-from pathlib import Path
+from functools import lru_cache
+from importlib.util import find_spec
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# Streamlit secrets locations, relative to the project root
+_SECRETS_DIR = ".streamlit"
+_SECRETS_FILE = os.path.join(_SECRETS_DIR, "secrets.toml")
+_SECRETS_EXAMPLE = os.path.join(_SECRETS_DIR, "secrets.example.toml")
+
+# Values shipped in secrets.example.toml that still have to be replaced
+_PLACEHOLDERS = frozenset({'REPLACE_WITH_CLIENT_ID', 'REPLACE_WITH_CLIENT_SECRET', 'REPLACE_WITH_API_KEY'})
+
+# Modules test_setup expects to be installed
+_REQUIRED_MODULES = ('streamlit', 'requests', 'rapidfuzz')
+
+# Credentials test_setup expects in secrets.toml, as (section, key) pairs
+_CREDENTIAL_KEYS = (
+    ('spotify', 'client_id'),
+    ('spotify', 'client_secret'),
+    ('youtube', 'api_key')
+)
+
+@lru_cache(maxsize=8)
+def _load_secrets_snapshot(path: str, mtime: float) -> dict:
+    """Parse a secrets TOML file into its sections; mtime keys out stale copies"""
+    if tomllib is not None:
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+
+    # Older Pythons without tomli: use the toml package installed with streamlit
+    import toml
+    with open(path, 'r') as f:
+        return toml.load(f)
 
 def print_header():
     """Print setup header"""
@@ -27,15 +67,46 @@ def check_python_version():
     print(f"✅ Python version: {sys.version.split()[0]}")
     return True
 
+def _missing_requirements(path: str = "requirements.txt") -> list:
+    """Return the requirement lines not satisfied by the installed packages"""
+    with open(path, 'r') as f:
+        lines = [line.strip() for line in f]
+    requirements = [line for line in lines if line and not line.startswith('#')]
+
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+        from packaging.requirements import Requirement
+    except ImportError:
+        # Can't check installed versions, so leave it all to pip
+        return requirements
+
+    missing = []
+    for line in requirements:
+        try:
+            requirement = Requirement(line)
+            installed = version(requirement.name)
+        except (PackageNotFoundError, ValueError):
+            missing.append(line)
+            continue
+        if not requirement.specifier.contains(installed, prereleases=True):
+            missing.append(line)
+    return missing
+
 def install_dependencies():
     """Install required dependencies"""
     print("\n📦 Installing dependencies...")
     
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        # Skip pip entirely when everything is already installed
+        missing = _missing_requirements()
+        if not missing:
+            print("✅ Dependencies already installed")
+            return True
+
+        subprocess.check_call([sys.executable, "-m", "pip", "install", *missing])
         print("✅ Dependencies installed successfully")
         return True
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, OSError):
         print("❌ Failed to install dependencies")
         return False
 
@@ -43,28 +114,23 @@ def setup_environment():
     """Set up environment configuration"""
     print("\n🔧 Setting up configuration...")
     
-    secrets_dir = Path(".streamlit")
-    secrets_example = secrets_dir / "secrets.example.toml"
-    secrets_file = secrets_dir / "secrets.toml"
-    
     # Create .streamlit directory if it doesn't exist
-    secrets_dir.mkdir(exist_ok=True)
+    os.makedirs(_SECRETS_DIR, exist_ok=True)
     
-    if secrets_file.exists():
+    if os.path.isfile(_SECRETS_FILE):
         print("⚠️  secrets.toml file already exists")
         response = input("Do you want to overwrite it? (y/N): ").lower()
         if response != 'y':
             print("Keeping existing secrets.toml file")
             return True
     
-    if not secrets_example.exists():
+    if not os.path.isfile(_SECRETS_EXAMPLE):
         print("❌ secrets.example.toml file not found")
         return False
     
     # Copy example to secrets.toml
     try:
-        with open(secrets_example, 'r') as src, open(secrets_file, 'w') as dst:
-            dst.write(src.read())
+        shutil.copyfile(_SECRETS_EXAMPLE, _SECRETS_FILE)
         print("✅ Created secrets.toml file from template")
         return True
     except Exception as e:
@@ -103,9 +169,7 @@ def get_credentials():
 
 def configure_credentials():
     """Configure API credentials interactively"""
-    secrets_file = Path(".streamlit/secrets.toml")
-    
-    if not secrets_file.exists():
+    if not os.path.isfile(_SECRETS_FILE):
         print("❌ secrets.toml file not found. Run setup first.")
         return False
     
@@ -120,27 +184,33 @@ def configure_credentials():
         print("❌ All credentials are required")
         return False
     
-    # Update secrets.toml file
+    # New value for each credential line
+    replacements = {
+        'client_id =': f'client_id = "{spotify_id}"\n',
+        'client_secret =': f'client_secret = "{spotify_secret}"\n',
+        'api_key =': f'api_key = "{youtube_key}"\n'
+    }
+
+    # Update secrets.toml file in one pass, swapping it in only once fully written
+    tmp_file = _SECRETS_FILE + '.tmp'
     try:
-        with open(secrets_file, 'r') as f:
-            lines = f.readlines()
-        
-        # Replace placeholder values
-        for i, line in enumerate(lines):
-            if line.startswith('client_id ='):
-                lines[i] = f'client_id = "{spotify_id}"\n'
-            elif line.startswith('client_secret ='):
-                lines[i] = f'client_secret = "{spotify_secret}"\n'
-            elif line.startswith('api_key ='):
-                lines[i] = f'api_key = "{youtube_key}"\n'
-        
-        with open(secrets_file, 'w') as f:
-            f.writelines(lines)
-        
+        # Create the temp file owner-only so the new credentials are never exposed
+        tmp_fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(_SECRETS_FILE, 'r') as src, os.fdopen(tmp_fd, 'w') as dst:
+            for line in src:
+                prefix = next((p for p in replacements if line.startswith(p)), None)
+                dst.write(replacements[prefix] if prefix else line)
+
+        # Keep secrets.toml's existing permissions across the swap
+        shutil.copymode(_SECRETS_FILE, tmp_file)
+        os.replace(tmp_file, _SECRETS_FILE)
+
         print("✅ Credentials saved to secrets.toml file")
         return True
         
     except Exception as e:
+        if os.path.isfile(tmp_file):
+            os.remove(tmp_file)
         print(f"❌ Failed to save credentials: {e}")
         return False
 
@@ -149,21 +219,21 @@ def test_setup():
     print("\n🧪 Testing setup...")
     
     try:
-        # Try importing main modules
-        import streamlit
-        import requests
+        # Check the main modules are installed without paying for importing them
+        missing = [name for name in _REQUIRED_MODULES if find_spec(name) is None]
+        if missing:
+            print(f"❌ Missing modules: {', '.join(missing)}")
+            return False
         
-        print("✅ All dependencies imported successfully")
+        print("✅ All dependencies installed")
         
         # Check if secrets.toml file exists and has credentials
-        secrets_file = Path(".streamlit/secrets.toml")
-        if secrets_file.exists():
-            # Read the secrets file directly
-            with open(secrets_file, 'r') as f:
-                content = f.read()
-            
-            # Check for credentials
-            if 'api_key = ' in content and 'client_id = ' in content and 'client_secret = ' in content:
+        if os.path.isfile(_SECRETS_FILE):
+            secrets = _load_secrets_snapshot(_SECRETS_FILE, os.path.getmtime(_SECRETS_FILE))
+
+            # Check for credentials that are set and no longer template placeholders
+            values = [secrets.get(section, {}).get(key) for section, key in _CREDENTIAL_KEYS]
+            if all(value and value not in _PLACEHOLDERS for value in values):
                 print("✅ API credentials configured")
             else:
                 print("❌ API credentials not fully configured")
@@ -172,9 +242,6 @@ def test_setup():
         
         return True
         
-    except ImportError as e:
-        print(f"❌ Import error: {e}")
-        return False
     except Exception as e:
         print(f"❌ Setup test failed: {e}")
         return False
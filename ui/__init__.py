@@ -4,7 +4,7 @@ UI Components Package
 from .header import render_header
 from .conversion.landing import render_landing_page
 from .conversion.preview import _render_playlist_preview, _update_playlist_card
-from .conversion.songs import render_youtube_songs, render_converted_songs, _render_enhanced_conversion_card
+from .conversion.songs import render_youtube_songs, render_converted_songs
 from .conversion.result import _render_post_conversion_buttons, generate_csv_report
 from .playlist.creation import render_playlist_creation_page
 from .processing import render_processing_page
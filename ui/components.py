@@ -3,7 +3,6 @@ UI Components - Main entry point that imports from modular structure
 """
 from .header import render_header
 from .conversion.landing import render_landing_page
-from .conversion.preview import _render_playlist_preview_completed
 from .conversion.songs import render_youtube_songs, render_converted_songs
 from .playlist.creation import render_playlist_creation_page
 from .processing import render_processing_page, _update_enhanced_progress
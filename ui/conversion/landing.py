@@ -2,30 +2,41 @@
 Landing Page Components
 """
 import streamlit as st
-import time
 import logging
-from typing import List, Dict, Optional
+from typing import Dict, Optional
 from utils.proper_oauth_manager import ProperOAuthManager
-from utils.session import get_session_state, set_session_state
+from utils.youtube_extractor import YouTubeExtractor
+from utils.session import set_session_state
 from config import Config
-from .preview import _render_playlist_preview, _update_playlist_card, _render_post_conversion_buttons
-from .songs import render_youtube_songs, render_converted_songs, _render_enhanced_conversion_card
+from core.processor import get_processor
+from .preview import _render_playlist_preview, _update_playlist_card
+from .result import _render_post_conversion_buttons
+from .songs import render_youtube_songs, render_converted_songs, update_song_list, add_display_fields, add_result_display_fields
 
 logger = logging.getLogger(__name__)
 
+# Number of song list redraws while results arrive; the final state is always drawn
+_SONG_LIST_REDRAWS = 20
+
+# Keeps the action row's height while the convert button is hidden
+_ACTION_SPACER = "<div style='height: 2.5rem;'></div>"
+
 def render_landing_page(oauth_manager) -> Optional[str]:
     """Render the landing page with YouTube URL input and in-place conversion"""
     
     # Check credentials first
-    if not Config.SPOTIFY_CLIENT_ID or not Config.SPOTIFY_CLIENT_SECRET:
-        st.error("Spotify credentials not configured. Please check your .env file.")
+    if not Config.credentials_configured():
+        st.error("API credentials not configured. Please check your .streamlit/secrets.toml file.")
         return None
 
+    # Bound once; this runs on every rerun, so read session state directly
+    state = st.session_state
+
     # URL input - always visible
     youtube_url = st.text_input(
         "YouTube Playlist URL",
         placeholder="https://www.youtube.com/playlist?list=...",
-        value=get_session_state('youtube_url', ''),
+        value=state.get('youtube_url', ''),
         help="Paste any public YouTube playlist URL"
     )
 
@@ -34,21 +45,13 @@ def render_landing_page(oauth_manager) -> Optional[str]:
         url_clean = youtube_url.strip()
 
         # Check if we already have parsed data for this URL
-        cached_url = get_session_state('cached_playlist_url', '')
+        cached_url = state.get('cached_playlist_url', '')
         if cached_url != url_clean:
             # Parse playlist immediately and store in session state
             with st.spinner("Parsing YouTube playlist..."):
                 playlist_data = _parse_full_playlist(url_clean)
                 if playlist_data:
-                    set_session_state('playlist_data', playlist_data)
-                    set_session_state('cached_playlist_url', url_clean)
-                    # Reset conversion state when new URL is parsed
-                    set_session_state('start_conversion', False)
-                    set_session_state('conversion_active', False)
-                    set_session_state('convert_button_clicked', False)  # Reset button clicked flag
-                    if 'conversion_state' in st.session_state:
-                        del st.session_state.conversion_state
-                    st.rerun()
+                    _reset_for_new_url(url_clean, playlist_data)
                 else:
                     st.error("Could not parse playlist. Please check the URL and try again.")
                     return None
@@ -57,74 +60,50 @@ def render_landing_page(oauth_manager) -> Optional[str]:
         st.markdown("<br>", unsafe_allow_html=True)
 
         # Display playlist details if available
-        playlist_data = get_session_state('playlist_data', None)
+        playlist_data = state.get('playlist_data')
         if playlist_data:
             # Show playlist preview - this handles all states internally
-            _render_playlist_preview(playlist_data['details'], len(playlist_data['songs']))
+            playlist_card = _render_playlist_preview(playlist_data['details'], len(playlist_data['songs']))
 
-            # Check if conversion should start
-            start_conversion = get_session_state('start_conversion', False)
-            conversion_active = get_session_state('conversion_active', False)
+            # Single source of truth for the conversion flow: idle -> converting -> completed
+            phase = state.get('conversion_phase', 'idle')
 
             # Center the convert button (moved above song list)
             st.markdown("<br>", unsafe_allow_html=True)
             col1, col2, col3 = st.columns([1, 2, 1])
             with col2:
-                if conversion_active:
+                action_slot = st.empty()
+                if phase == 'converting':
                     # During active conversion, show empty space (playlist card shows "Converting")
-                    st.markdown("<div style='height: 2.5rem;'></div>", unsafe_allow_html=True)
-                elif get_session_state('conversion_completed', False):
+                    action_slot.markdown(_ACTION_SPACER, unsafe_allow_html=True)
+                elif phase == 'completed':
                     # Show action buttons after conversion
-                    _render_post_conversion_buttons(oauth_manager)
-                elif get_session_state('start_conversion', False) or get_session_state('convert_button_clicked', False):
-                    # Conversion is starting or button was clicked, show starting message
-                    st.markdown("""
-                    <div style='
-                        height: 2.5rem; 
-                        display: flex; 
-                        align-items: center; 
-                        justify-content: center; 
-                        color: #FF6B35; 
-                        font-style: italic; 
-                        font-weight: 500;
-                        background: rgba(255, 107, 53, 0.1);
-                        border-radius: 0.5rem;
-                        border: 1px solid rgba(255, 107, 53, 0.2);
-                    '>
-                        Starting conversion...
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    # Show active convert button
-                    convert_clicked = st.button("Convert to Spotify", type="primary")
-                    if convert_clicked:
-                        # Set flag to hide button on next render
-                        set_session_state('convert_button_clicked', True)
-                        set_session_state('start_conversion', True)
-                        st.rerun()  # Force immediate rerun to hide button
+                    with action_slot.container():
+                        _render_post_conversion_buttons(oauth_manager)
+                elif action_slot.button("Convert to Spotify", type="primary"):
+                    # Start converting in this run, swapping the button for the spacer
+                    phase = 'converting'
+                    state['conversion_phase'] = phase
+                    action_slot.markdown(_ACTION_SPACER, unsafe_allow_html=True)
+                elif st.button("Refresh playlist", help="Fetch the latest songs from YouTube"):
+                    # Playlists are cached for an hour, so drop the cache and parse again
+                    _fetch_full_playlist.clear()
+                    state['cached_playlist_url'] = ''
+                    st.rerun()
 
             # Display individual song cards
-            if not get_session_state('conversion_completed', False):
+            song_list = None
+            if phase != 'completed':
                 # Before/during conversion - render normal YouTube song cards
-                song_containers = render_youtube_songs(playlist_data['songs'])
-                # Store containers in session state for later use during conversion
-                set_session_state('song_containers', song_containers)
+                song_list = render_youtube_songs(playlist_data['songs'])
             else:
                 # Conversion completed - render converted song cards with final states
-                results = get_session_state('results', [])
-                song_containers = render_converted_songs(playlist_data['songs'], results)
-                # Store the converted containers
-                set_session_state('song_containers', song_containers)
-
-            # Handle conversion if it should start
-            if start_conversion and not conversion_active:
-                set_session_state('start_conversion', False)
-                set_session_state('conversion_active', True)
-                st.rerun()
+                results = state.get('results', [])
+                render_converted_songs(playlist_data['songs'], results)
 
             # Handle active conversion
-            if conversion_active:
-                _handle_in_place_conversion(playlist_data, song_containers, oauth_manager)
+            if phase == 'converting':
+                _handle_in_place_conversion(playlist_data, playlist_card, song_list, action_slot, oauth_manager)
 
         else:
             st.warning("Could not parse playlist. Please check the URL and try again.")
@@ -132,85 +111,77 @@ def render_landing_page(oauth_manager) -> Optional[str]:
 
     return None
 
+def _reset_for_new_url(url: str, playlist_data: Dict):
+    """Store a newly parsed playlist and reset the conversion for it"""
+    st.session_state.update({
+        'playlist_data': playlist_data,
+        'cached_playlist_url': url,
+        'conversion_phase': 'idle'
+    })
+    st.session_state.pop('conversion_state', None)
+
 def _parse_full_playlist(youtube_url: str) -> Optional[Dict]:
     """Parse complete playlist data immediately including all songs"""
     try:
-        from utils.youtube_extractor import YouTubeExtractor
-        from config import Config
-
-        # Use configured API key
-        api_key = Config.YOUTUBE_API_KEY
-        if not api_key or api_key == 'your_youtube_api_key_here':
-            return None
-
-        extractor = YouTubeExtractor(api_key)
-
-        # Extract playlist ID
-        playlist_id = extractor.extract_playlist_id(youtube_url)
-        if not playlist_id:
-            return None
-
-        # Get playlist info
-        playlist_info = extractor.get_playlist_info(playlist_id)
-        if not playlist_info:
-            return None
-
-        # Get all videos from playlist
-        videos = extractor.get_playlist_videos(playlist_id)
-        if not videos:
-            return None
-
-        # Get actual video count and thumbnail
-        video_count = len(videos)
-        thumbnail_url = _get_playlist_thumbnail(playlist_id, api_key)
-
-        # Prepare playlist details
-        playlist_details = {
-            'title': playlist_info.get('title', 'Unknown Playlist'),
-            'description': playlist_info.get('description', ''),
-            'song_count': video_count,
-            'thumbnail': thumbnail_url,
-            'channel': playlist_info.get('channel', 'Unknown Channel')
-        }
-
-        # Return complete playlist data
-        return {
-            'details': playlist_details,
-            'songs': videos,
-            'playlist_id': playlist_id
-        }
-    except Exception as e:
-        print(f"Error parsing full playlist: {e}")
-        return None
-
-def _get_playlist_thumbnail(playlist_id: str, api_key: str) -> Optional[str]:
-    """Get playlist thumbnail URL"""
-    try:
-        import requests
-
-        params = {
-            'part': 'snippet',
-            'id': playlist_id,
-            'key': api_key
-        }
-
-        response = requests.get("https://www.googleapis.com/youtube/v3/playlists", params=params)
-        response.raise_for_status()
-        data = response.json()
-
-        if data.get('items'):
-            thumbnails = data['items'][0]['snippet'].get('thumbnails', {})
-            # Try to get the best quality thumbnail available
-            for quality in ['maxres', 'standard', 'high', 'medium', 'default']:
-                if quality in thumbnails:
-                    return thumbnails[quality]['url']
+        return _fetch_full_playlist(youtube_url)
     except Exception:
-        pass
-    return None
+        logger.exception("Error parsing full playlist for url=%s", youtube_url)
+        return None
 
-def _handle_in_place_conversion(playlist_data: Dict, song_containers: List, oauth_manager):
+@st.cache_resource(show_spinner=False)
+def _get_extractor(api_key: str) -> YouTubeExtractor:
+    """Share one extractor, and its pooled HTTP session, across reruns and sessions"""
+    return YouTubeExtractor(api_key)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_full_playlist(youtube_url: str) -> Dict:
+    """Fetch playlist details and songs; failures raise so they aren't cached"""
+    # Use configured API key
+    api_key = Config.YOUTUBE_API_KEY
+    if not api_key or api_key == 'your_youtube_api_key_here':
+        raise ValueError("YouTube API key not configured")
+
+    extractor = _get_extractor(api_key)
+
+    # Extract playlist ID
+    playlist_id = extractor.extract_playlist_id(youtube_url)
+    if not playlist_id:
+        raise ValueError("Invalid YouTube playlist URL")
+
+    # Get playlist info
+    playlist_info = extractor.get_playlist_info(playlist_id)
+    if not playlist_info:
+        raise ValueError("Playlist not found")
+
+    # Get all videos from playlist
+    videos = extractor.get_playlist_videos(playlist_id)
+    if not videos:
+        raise ValueError("No videos found in playlist")
+
+    # Render-ready fields are computed here once rather than on every rerun
+    add_display_fields(videos)
+
+    # Get actual video count
+    video_count = len(videos)
+
+    # Prepare playlist details
+    playlist_details = {
+        'title': playlist_info.get('title', 'Unknown Playlist'),
+        'description': playlist_info.get('description', ''),
+        'song_count': video_count,
+        'thumbnail': playlist_info.get('thumbnail'),
+        'channel': playlist_info.get('channel', 'Unknown Channel')
+    }
+
+    # Return complete playlist data
+    return {
+        'details': playlist_details,
+        'songs': videos,
+        'playlist_id': playlist_id
+    }
+
+def _handle_in_place_conversion(playlist_data: Dict, playlist_card, song_list, action_slot, oauth_manager):
     """Handle the conversion process in place on the landing page"""
-    from core.processor import PlaylistProcessor
     
     # Initialize conversion state if not exists
     if 'conversion_state' not in st.session_state:
@@ -224,81 +195,33 @@ def _handle_in_place_conversion(playlist_data: Dict, song_containers: List, oaut
     songs = playlist_data['songs']
     conversion_state = st.session_state.conversion_state
 
-    # Use the existing song containers
-    if len(song_containers) != len(songs):
-        st.error("Mismatch between song containers and songs. Please refresh the page.")
-        set_session_state('conversion_active', False)
-        return
-
     # Start conversion if not started
     if not conversion_state['started']:
         conversion_state['started'] = True
         conversion_state['results'] = [None] * len(songs)
         
         # Update the playlist card to converting state
-        playlist_card_container = get_session_state('playlist_card_container', None)
-        playlist_details = get_session_state('playlist_details', playlist_data['details'])
-        if playlist_card_container:
-            _update_playlist_card(playlist_card_container, playlist_details, "converting", 0, len(songs))
-
-        # Initialize processor
-        processor = PlaylistProcessor()
-
-        # Process songs one by one with real-time display using existing containers
-        for i, song in enumerate(songs):
-            conversion_state['current_index'] = i
-
-            # Transform existing container to processing state
-            _render_enhanced_conversion_card(song_containers[i], song, i, 'processing', None)
-            
-            # Small delay to show processing animation
-            time.sleep(0.5)
-
-            # Parse song info
-            parsed = processor._parse_video_title(song['title'])
-
-            # Search for Spotify match
-            spotify_match = None
-            if processor.spotify_manager:
-                try:
-                    spotify_match = processor._find_spotify_match(parsed['artist'], parsed['title'])
-                except Exception as e:
-                    st.warning(f"Spotify search failed for '{song['title']}': {str(e)}")
-
-            # Create result
-            result = {
-                'original_title': song['title'],
-                'channel': song['channel'],
-                'parsed_artist': parsed['artist'],
-                'parsed_title': parsed['title'],
-                'found': spotify_match is not None,
-                'video_id': song.get('video_id', ''),
-                'published': song.get('published', '')
-            }
-
-            if spotify_match:
-                result.update({
-                    'spotify_artist': spotify_match['artist'],
-                    'spotify_title': spotify_match['title'],
-                    'spotify_uri': spotify_match['uri'],
-                    'confidence': spotify_match['confidence'],
-                    'spotify_preview_url': spotify_match.get('preview_url', ''),
-                    'album_art_url': spotify_match.get('album_art_url', '')
-                })
-            else:
-                if not processor.spotify_manager:
-                    result['reason'] = 'Spotify authentication required for matching'
-                else:
-                    result['reason'] = 'No match found on Spotify'
+        _update_playlist_card(playlist_card, playlist_data['details'], "converting", 0, len(songs))
 
-            conversion_state['results'][i] = result
+        # Every song is searched at once, so show them all as processing
+        results = conversion_state['results']
+        if song_list:
+            update_song_list(song_list, songs, results)
+        redraw_every = max(1, len(songs) // _SONG_LIST_REDRAWS)
 
-            # Transform container to final state (found or not found)
-            status = 'found' if result['found'] else 'not_found'
-            _render_enhanced_conversion_card(song_containers[i], song, i, status, result)
+        def show_result(completed, index, result):
+            conversion_state['current_index'] = completed - 1
 
-            # Small delay for visual effect
-            time.sleep(0.3)
+            # Cards are redrawn on every rerun, so escape their text once here
+            add_result_display_fields(result)
+            results[index] = result
+
+            # Transform finished cards to their final state (found or not found)
+            if song_list and (completed % redraw_every == 0 or completed == len(songs)):
+                update_song_list(song_list, songs, results)
+
+        # The processor runs the searches concurrently and paces them with its rate limiter
+        get_processor().match_videos(songs, show_result)
 
     # Check if conversion is complete
     if conversion_state['current_index'] >= len(songs) - 1 and not conversion_state['completed']:
@@ -309,16 +232,10 @@ def _handle_in_place_conversion(playlist_data: Dict, song_containers: List, oaut
         found_songs = [r for r in conversion_state['results'] if r and r.get('found', False)]
 
         # Update the playlist card to show completion status
-        playlist_card_container = get_session_state('playlist_card_container', None)
-        playlist_details = get_session_state('playlist_details', playlist_data['details'])
-        if playlist_card_container:
-            _update_playlist_card(playlist_card_container, playlist_details, "completed", len(found_songs), len(songs))
-        
-        # Mark conversion as completed and inactive
-        set_session_state('conversion_completed', True)
-        set_session_state('conversion_active', False)
-        
-        # Store the final converted containers to preserve their state
-        set_session_state('final_song_containers', song_containers)
+        _update_playlist_card(playlist_card, playlist_data['details'], "completed", len(found_songs), len(songs))
         
-        st.rerun()
\ No newline at end of file
+        # Mark conversion as completed and show the next steps in place; the song
+        # list and playlist card already show their final state, so no rerun is needed
+        set_session_state('conversion_phase', 'completed')
+        with action_slot.container():
+            _render_post_conversion_buttons(oauth_manager)
\ No newline at end of file
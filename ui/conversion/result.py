@@ -8,11 +8,18 @@ from typing import List, Dict
 from utils.session import get_session_state, set_session_state
 from ui.conversion.preview import _reset_conversion_state
 
+# Column names of the CSV report
+_CSV_HEADER = (
+    'Index', 'Original Title', 'Original Channel',
+    'Spotify Artist', 'Spotify Title', 'Confidence',
+    'Status', 'Spotify URI'
+)
+
 def _render_post_conversion_buttons(oauth_manager):
     """Render action buttons after conversion is complete"""
-    found_songs = [r for r in get_session_state('results', []) if r and r.get('found', False)]
+    has_matches = any(r and r.get('found', False) for r in get_session_state('results', []))
     
-    if found_songs:
+    if has_matches:
         if oauth_manager and oauth_manager.is_authenticated():
             # User is authenticated - show create playlist button
             if st.button("Create Spotify Playlist", type="primary"):
@@ -31,32 +38,28 @@ def _render_post_conversion_buttons(oauth_manager):
             _reset_conversion_state()
             st.rerun()
 
+@st.cache_data(show_spinner=False, max_entries=8)
 def generate_csv_report(results: List[Dict]) -> str:
-    """Generate CSV report of results"""
-    import io
-    import csv
-    
+    """Generate CSV report of results, reused across reruns for the same results"""
     output = io.StringIO()
     writer = csv.writer(output)
     
-    # Header
-    writer.writerow([
-        'Index', 'Original Title', 'Original Channel', 
-        'Spotify Artist', 'Spotify Title', 'Confidence', 
-        'Status', 'Spotify URI'
-    ])
+    writer.writerow(_CSV_HEADER)
     
     # Data
     for i, song in enumerate(results, 1):
-        writer.writerow([
-            i,
-            song.get('original_title', ''),
-            song.get('channel_name', ''),
-            song.get('spotify_artist', '') if song.get('found') else '',
-            song.get('spotify_title', '') if song.get('found') else '',
-            f"{song.get('confidence', 0.0):.2f}" if song.get('found') else '',
-            'Found' if song.get('found') else 'Not Found',
-            song.get('spotify_uri', '') if song.get('found') else ''
-        ])
+        if song.get('found'):
+            writer.writerow([
+                i,
+                song.get('original_title', ''),
+                song.get('channel_name', ''),
+                song.get('spotify_artist', ''),
+                song.get('spotify_title', ''),
+                f"{song.get('confidence', 0.0):.2f}",
+                'Found',
+                song.get('spotify_uri', '')
+            ])
+        else:
+            writer.writerow([i, song.get('original_title', ''), song.get('channel_name', ''), '', '', '', 'Not Found', ''])
     
     return output.getvalue()
\ No newline at end of file
@@ -2,210 +2,212 @@
 Song Rendering Components
 """
 import streamlit as st
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable
 from utils.session import get_session_state, set_session_state
+from ..shared.utils import safe_escape_text, render_html, get_confidence_class
+
+# Card markup, built once and filled in per song with str.format
+_YOUTUBE_CARD_TEMPLATE = """
+<div class="youtube-song-card {extra_class}" id="song_container_{index}" style="
+    display: flex;
+    align-items: center;
+    gap: 0.75rem;
+    padding: 0.75rem;
+    margin: 0.5rem 0;
+    background: rgba(255, 255, 255, 0.05);
+    backdrop-filter: blur(10px);
+    border: 1px solid rgba(255, 255, 255, 0.1);
+    border-radius: 12px;
+    box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);
+">
+    <img src="{thumbnail_url}" loading="lazy" decoding="async" fetchpriority="low" style="width: 60px; height: 45px; border-radius: 6px; object-fit: cover;" alt="Video thumbnail" />
+    <div style="flex: 1; min-width: 0;">
+        <div style="font-weight: 500; color: #ffffff; margin-bottom: 0.25rem; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;">{title}</div>
+        <div style="font-size: 0.875rem; color: #cccccc; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;">{channel}</div>
+    </div>
+</div>
+""".strip()
+
+# Split YouTube/Spotify card; the Spotify side depends on the conversion state
+_CONVERSION_CARD_TEMPLATE = """
+<div class="conversion-card {state_class}" id="song_container_{index}">
+    <div class="conversion-card-content">
+        <div class="youtube-side">
+            <div style="display: flex; align-items: center; gap: 0.75rem;">
+                <img src="{thumbnail_url}" loading="lazy" decoding="async" fetchpriority="low" style="width: 60px; height: 45px; border-radius: 6px; object-fit: cover;" alt="Video thumbnail" />
+                <div style="flex: 1; min-width: 0;">
+                    <div class="side-title">{title}</div>
+                    <div class="side-artist">{channel}</div>
+                </div>
+            </div>
+        </div>
+        {spotify_side}
+    </div>
+</div>
+""".strip()
+
+_PROCESSING_SIDE = """
+<div class="spotify-side loading">
+            <div class="loading-placeholder wide"></div>
+            <div class="loading-placeholder narrow"></div>
+            <div class="status-indicator processing">
+                <div class="status-icon processing-icon"></div>
+                Analyzing...
+            </div>
+        </div>
+""".strip()
+
+_FOUND_SIDE_TEMPLATE = """
+<div class="spotify-side loaded">
+            <div class="side-title">{spotify_title}</div>
+            <div class="side-artist">{spotify_artist}</div>
+            <div class="side-meta">
+                <span class="confidence-score {confidence_class}">{confidence:.0%} match</span>
+                <span class="status-indicator found">
+                    <div class="status-icon found-icon"></div>
+                    Matched
+                </span>
+            </div>
+        </div>
+""".strip()
+
+_NOT_FOUND_SIDE_TEMPLATE = """
+<div class="spotify-side loaded">
+            <div class="side-title" style="color: var(--text-muted);">—</div>
+            <div class="side-artist" style="color: var(--text-muted); font-size: 0.8rem;">{reason}</div>
+            <div class="side-meta">
+                <span class="status-indicator not-found">
+                    <div class="status-icon not-found-icon"></div>
+                    No Match
+                </span>
+            </div>
+        </div>
+""".strip()
 
-def render_youtube_songs(songs: List[Dict]) -> List:
+# Session key for the last built song list HTML and the songs/results it was built from
+_SONG_LIST_HTML_KEY = '_song_list_html'
+
+def render_youtube_songs(songs: List[Dict]):
     """Render individual YouTube songs in compact cards with thumbnails"""
     if not songs:
-        return []
+        return None
 
     st.markdown("### Songs in Playlist")
 
-    # Store containers for potential animation updates
-    song_containers = []
+    # One container holds the whole list so conversion can redraw it in batches
+    song_list = st.empty()
 
-    for i, song in enumerate(songs):
-        title = song.get('title', 'Unknown Title')
-        channel = song.get('channel', 'Unknown Channel')
-        video_id = song.get('video_id', '')
+    # Create cards with sequential animation delay
+    render_html(_song_list_html(songs, None, lambda: "\n".join(
+        _youtube_card_html(song, i, f"animate-delay-{min(i + 1, 10)}") for i, song in enumerate(songs)
+    )), song_list)
 
-        # Generate YouTube thumbnail URL
-        thumbnail_url = f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg" if video_id else ""
-
-        # Create card with sequential animation delay
-        delay_class = f"animate-delay-{min(i + 1, 10)}"
-
-        # Create container that can be updated during conversion
-        container = st.empty()
-        song_containers.append(container)
-
-        # Initial YouTube-only display
-        with container:
-            st.markdown(f"""
-            <div class="youtube-song-card {delay_class}" id="song_container_{i}" style="
-                display: flex;
-                align-items: center;
-                gap: 0.75rem;
-                padding: 0.75rem;
-                margin: 0.5rem 0;
-                background: rgba(255, 255, 255, 0.05);
-                backdrop-filter: blur(10px);
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 12px;
-                box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);
-            ">
-                <img src="{thumbnail_url}" style="width: 60px; height: 45px; border-radius: 6px; object-fit: cover;" alt="Video thumbnail" />
-                <div style="flex: 1; min-width: 0;">
-                    <div style="font-weight: 500; color: #ffffff; margin-bottom: 0.25rem; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;">{title}</div>
-                    <div style="font-size: 0.875rem; color: #cccccc; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;">{channel}</div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    return song_containers
+    return song_list
 
-def render_converted_songs(songs: List[Dict], results: List[Dict]) -> List:
+def update_song_list(song_list, songs: List[Dict], results: List[Optional[Dict]]):
+    """Redraw the song list mid-conversion; songs without a result yet show as processing"""
+    cards = [
+        _conversion_card_html(song, i, _result_status(result), result) if result
+        else _conversion_card_html(song, i, 'processing', None)
+        for i, (song, result) in enumerate(zip(songs, results))
+    ]
+    render_html("\n".join(cards), song_list)
+
+def render_converted_songs(songs: List[Dict], results: List[Dict]):
     """Render converted song cards with their final states"""
     if not songs or not results:
-        return []
+        return
 
     st.markdown("### Songs in Playlist")
 
-    # Store containers for the converted songs
-    song_containers = []
+    # Final cards never change again, so send the whole list as one element
+    render_html(_song_list_html(songs, results, lambda: _converted_songs_html(songs, results)))
 
+def _converted_songs_html(songs: List[Dict], results: List[Dict]) -> str:
+    """Build the HTML of the converted song list"""
+    cards = []
     for i, (song, result) in enumerate(zip(songs, results)):
-        # Create container for each converted song
-        container = st.empty()
-        song_containers.append(container)
-
-        # Render the song in its final converted state
         if result:
-            status = 'found' if result.get('found', False) else 'not_found'
-            _render_enhanced_conversion_card(container, song, i, status, result)
+            cards.append(_conversion_card_html(song, i, _result_status(result), result))
         else:
             # Fallback to original YouTube card if no result
-            title = song.get('title', 'Unknown Title')
-            channel = song.get('channel', 'Unknown Channel')
-            video_id = song.get('video_id', '')
-            thumbnail_url = f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg" if video_id else ""
-
-            with container:
-                st.markdown(f"""
-                <div class="youtube-song-card" id="song_container_{i}" style="
-                    display: flex;
-                    align-items: center;
-                    gap: 0.75rem;
-                    padding: 0.75rem;
-                    margin: 0.5rem 0;
-                    background: rgba(255, 255, 255, 0.05);
-                    backdrop-filter: blur(10px);
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                    border-radius: 12px;
-                    box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);
-                ">
-                    <img src="{thumbnail_url}" style="width: 60px; height: 45px; border-radius: 6px; object-fit: cover;" alt="Video thumbnail" />
-                    <div style="flex: 1; min-width: 0;">
-                        <div style="font-weight: 500; color: #ffffff; margin-bottom: 0.25rem; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;">{title}</div>
-                        <div style="font-size: 0.875rem; color: #cccccc; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;">{channel}</div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-    
-    return song_containers
-
-def _render_enhanced_conversion_card(container, song: Dict, index: int, status: str, result: Optional[Dict]):
-    """Render enhanced conversion card that transforms existing YouTube cards"""
-    title = song.get('title', 'Unknown Title')
-    channel = song.get('channel', 'Unknown Channel')
-    video_id = song.get('video_id', '')
-
-    # Generate YouTube thumbnail URL
-    thumbnail_url = f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg" if video_id else ""
-
-    # Clean and escape any problematic characters in content
-    safe_title = title.replace('"', '"').replace('<', '<').replace('>', '>')
-    safe_channel = channel.replace('"', '"').replace('<', '<').replace('>', '>')
-
-    with container:
-        if status == 'processing':
-            # Transform to processing state with split design
-            st.markdown(f"""
-            <div class="conversion-card processing-transform" id="song_container_{index}">
-                <div class="conversion-card-content">
-                    <div class="youtube-side">
-                        <div style="display: flex; align-items: center; gap: 0.75rem;">
-                            <img src="{thumbnail_url}" style="width: 60px; height: 45px; border-radius: 6px; object-fit: cover;" alt="Video thumbnail" />
-                            <div style="flex: 1; min-width: 0;">
-                                <div class="side-title">{safe_title}</div>
-                                <div class="side-artist">{safe_channel}</div>
-                            </div>
-                        </div>
-                    </div>
-                    <div class="spotify-side loading">
-                        <div class="loading-placeholder wide"></div>
-                        <div class="loading-placeholder narrow"></div>
-                        <div class="status-indicator processing">
-                            <div class="status-icon processing-icon"></div>
-                            Analyzing...
-                        </div>
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        elif status == 'found' and result:
-            # Transform to found state
-            confidence = result.get('confidence', 0)
-            confidence_class = 'high' if confidence >= 0.8 else 'medium' if confidence >= 0.5 else 'low'
-            safe_spotify_title = result.get('spotify_title', 'Unknown').replace('"', '"').replace('<', '<').replace('>', '>')
-            safe_spotify_artist = result.get('spotify_artist', 'Unknown').replace('"', '"').replace('<', '<').replace('>', '>')
-            
-            st.markdown(f"""
-            <div class="conversion-card found-transform" id="song_container_{index}">
-                <div class="conversion-card-content">
-                    <div class="youtube-side">
-                        <div style="display: flex; align-items: center; gap: 0.75rem;">
-                            <img src="{thumbnail_url}" style="width: 60px; height: 45px; border-radius: 6px; object-fit: cover;" alt="Video thumbnail" />
-                            <div style="flex: 1; min-width: 0;">
-                                <div class="side-title">{safe_title}</div>
-                                <div class="side-artist">{safe_channel}</div>
-                            </div>
-                        </div>
-                    </div>
-                    <div class="spotify-side loaded">
-                        <div class="side-title">{safe_spotify_title}</div>
-                        <div class="side-artist">{safe_spotify_artist}</div>
-                        <div class="side-meta">
-                            <span class="confidence-score {confidence_class}">{confidence:.0%} match</span>
-                            <span class="status-indicator found">
-                                <div class="status-icon found-icon"></div>
-                                Matched
-                            </span>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        else:
-            # Transform to not found state
-            reason = result.get('reason', 'No match found') if result else 'No match found'
-            safe_reason = reason.replace('"', '"').replace('<', '<').replace('>', '>')
-            
-            st.markdown(f"""
-            <div class="conversion-card not-found-transform" id="song_container_{index}">
-                <div class="conversion-card-content">
-                    <div class="youtube-side">
-                        <div style="display: flex; align-items: center; gap: 0.75rem;">
-                            <img src="{thumbnail_url}" style="width: 60px; height: 45px; border-radius: 6px; object-fit: cover;" alt="Video thumbnail" />
-                            <div style="flex: 1; min-width: 0;">
-                                <div class="side-title">{safe_title}</div>
-                                <div class="side-artist">{safe_channel}</div>
-                            </div>
-                        </div>
-                    </div>
-                    <div class="spotify-side loaded">
-                        <div class="side-title" style="color: var(--text-muted);">—</div>
-                        <div class="side-artist" style="color: var(--text-muted); font-size: 0.8rem;">{safe_reason}</div>
-                        <div class="side-meta">
-                            <span class="status-indicator not-found">
-                                <div class="status-icon not-found-icon"></div>
-                                No Match
-                            </span>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
\ No newline at end of file
+            cards.append(_youtube_card_html(song, i))
+    return "\n".join(cards)
+
+def _song_list_html(songs: List[Dict], results: Optional[List[Dict]], build: Callable[[], str]) -> str:
+    """Reuse the last song list HTML while the same songs and results objects are rendered"""
+    # Reruns from unrelated widgets must re-send the list but needn't rebuild every card;
+    # holding the objects themselves keeps the identity check safe from id reuse
+    cached = st.session_state.get(_SONG_LIST_HTML_KEY)
+    if cached and cached[0] is songs and cached[1] is results:
+        return cached[2]
+
+    markup = build()
+    st.session_state[_SONG_LIST_HTML_KEY] = (songs, results, markup)
+    return markup
+
+def _result_status(result: Dict) -> str:
+    """Card status for a finished conversion result"""
+    return 'found' if result.get('found', False) else 'not_found'
+
+def add_display_fields(songs: List[Dict]):
+    """Precompute each song's thumbnail URL and escaped text once, when the playlist is parsed"""
+    for song in songs:
+        video_id = song.get('video_id', '')
+        song['thumbnail_url'] = f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg" if video_id else ""
+        song['safe_title'] = safe_escape_text(song.get('title', 'Unknown Title'))
+        song['safe_channel'] = safe_escape_text(song.get('channel', 'Unknown Channel'))
+
+def add_result_display_fields(result: Dict):
+    """Precompute a conversion result's escaped Spotify text once, when the result is stored"""
+    if result.get('found'):
+        result['safe_spotify_title'] = safe_escape_text(result.get('spotify_title', 'Unknown'))
+        result['safe_spotify_artist'] = safe_escape_text(result.get('spotify_artist', 'Unknown'))
+    else:
+        result['safe_reason'] = safe_escape_text(result.get('reason', 'No match found'))
+
+def _youtube_card_html(song: Dict, index: int, extra_class: str = '') -> str:
+    """Build the HTML of a YouTube-only song card"""
+    return _YOUTUBE_CARD_TEMPLATE.format(
+        extra_class=extra_class,
+        index=index,
+        thumbnail_url=song['thumbnail_url'],
+        title=song['safe_title'],
+        channel=song['safe_channel']
+    )
+
+def _conversion_card_html(song: Dict, index: int, status: str, result: Optional[Dict]) -> str:
+    """Build the HTML of a conversion card in its processing, found or not found state"""
+    if status == 'processing':
+        # Transform to processing state with split design
+        state_class = 'processing-transform'
+        spotify_side = _PROCESSING_SIDE
+
+    elif status == 'found' and result:
+        # Transform to found state; bind each field once
+        get = result.get
+        confidence = get('confidence', 0)
+        spotify_title = get('safe_spotify_title') or safe_escape_text(get('spotify_title', 'Unknown'))
+        spotify_artist = get('safe_spotify_artist') or safe_escape_text(get('spotify_artist', 'Unknown'))
+        state_class = 'found-transform'
+        spotify_side = _FOUND_SIDE_TEMPLATE.format(
+            spotify_title=spotify_title,
+            spotify_artist=spotify_artist,
+            confidence_class=get_confidence_class(confidence),
+            confidence=confidence
+        )
+
+    else:
+        # Transform to not found state
+        reason = (result.get('safe_reason') or safe_escape_text(result.get('reason', 'No match found'))) if result else 'No match found'
+        state_class = 'not-found-transform'
+        spotify_side = _NOT_FOUND_SIDE_TEMPLATE.format(reason=reason)
+
+    return _CONVERSION_CARD_TEMPLATE.format(
+        state_class=state_class,
+        index=index,
+        thumbnail_url=song['thumbnail_url'],
+        title=song['safe_title'],
+        channel=song['safe_channel'],
+        spotify_side=spotify_side
+    )
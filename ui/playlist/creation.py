@@ -5,12 +5,81 @@ import streamlit as st
 import logging
 from typing import List, Dict, Optional
 from utils.proper_oauth_manager import ProperOAuthManager
+from utils.spotify_manager import SpotifyManager
 from utils.session import get_session_state, set_session_state
 from config import Config
 from ..conversion.preview import _reset_conversion_state
+from ..shared.utils import safe_escape_text, render_html
 
 logger = logging.getLogger(__name__)
 
+# Card markup, built once and filled in with str.format
+_SUCCESS_CARD_TEMPLATE = """
+<div style="
+    background: linear-gradient(135deg, #1DB954 0%, #1ed760 100%);
+    padding: 2rem;
+    border-radius: 16px;
+    text-align: center;
+    margin: 1rem 0 2rem 0;
+    box-shadow: 0 8px 32px rgba(29, 185, 84, 0.3);
+">
+    <h2 style="color: white; margin: 0 0 1rem 0;">
+        <div style="display: inline-flex; align-items: center; gap: 0.5rem;">
+            <div class="success-icon"></div>
+            {playlist_name}
+        </div>
+    </h2>
+    <p style="color: rgba(255,255,255,0.9); margin: 0 0 1.5rem 0; font-size: 1.1rem;">
+        {track_count} songs added successfully
+    </p>
+    <a href="{playlist_url}" target="_blank" style="
+        display: inline-block;
+        background: rgba(255,255,255,0.2);
+        color: white;
+        padding: 0.75rem 2rem;
+        border-radius: 25px;
+        text-decoration: none;
+        font-weight: 500;
+        backdrop-filter: blur(10px);
+        border: 1px solid rgba(255,255,255,0.3);
+        transition: all 0.3s ease;
+    ">
+        <div style="display: inline-flex; align-items: center; gap: 0.5rem;">
+            <div class="spotify-icon"></div>
+            Open in Spotify
+        </div>
+    </a>
+</div>
+""".strip()
+
+# Three-column row holding the conversion summary statistic cards
+_STAT_GRID_TEMPLATE = """
+<div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem;">
+{cards}
+</div>
+""".strip()
+
+# Conversion summary statistic card; colours vary per statistic
+_STAT_CARD_TEMPLATE = """
+<div style="
+    background: {background};
+    backdrop-filter: var(--glass-backdrop);
+    border: 1px solid {border};
+    border-radius: var(--border-radius);
+    padding: 1.5rem;
+    text-align: center;
+    box-shadow: var(--glass-shadow);
+    margin: 0.5rem 0;
+">
+    <div style="font-size: 2rem; font-weight: 600; color: {color}; margin-bottom: 0.5rem;">
+        {value}
+    </div>
+    <div style="color: var(--text-secondary); font-size: 0.9rem; text-transform: uppercase; letter-spacing: 0.5px;">
+        {label}
+    </div>
+</div>
+""".strip()
+
 def render_playlist_creation_page(results: List[Dict], oauth_manager) -> Optional[str]:
     """Render the playlist creation page"""
     
@@ -25,43 +94,11 @@ def render_playlist_creation_page(results: List[Dict], oauth_manager) -> Optiona
         
         # Create a prominent success card
         playlist_url = f"https://open.spotify.com/playlist/{playlist_id}"
-        st.markdown(f"""
-        <div style="
-            background: linear-gradient(135deg, #1DB954 0%, #1ed760 100%);
-            padding: 2rem;
-            border-radius: 16px;
-            text-align: center;
-            margin: 1rem 0 2rem 0;
-            box-shadow: 0 8px 32px rgba(29, 185, 84, 0.3);
-        ">
-            <h2 style="color: white; margin: 0 0 1rem 0;">
-                <div style="display: inline-flex; align-items: center; gap: 0.5rem;">
-                    <div class="success-icon"></div>
-                    {playlist_name}
-                </div>
-            </h2>
-            <p style="color: rgba(255,255,255,0.9); margin: 0 0 1.5rem 0; font-size: 1.1rem;">
-                {track_count} songs added successfully
-            </p>
-            <a href="{playlist_url}" target="_blank" style="
-                display: inline-block;
-                background: rgba(255,255,255,0.2);
-                color: white;
-                padding: 0.75rem 2rem;
-                border-radius: 25px;
-                text-decoration: none;
-                font-weight: 500;
-                backdrop-filter: blur(10px);
-                border: 1px solid rgba(255,255,255,0.3);
-                transition: all 0.3s ease;
-            ">
-                <div style="display: inline-flex; align-items: center; gap: 0.5rem;">
-                    <div class="spotify-icon"></div>
-                    Open in Spotify
-                </div>
-            </a>
-        </div>
-        """, unsafe_allow_html=True)
+        render_html(_SUCCESS_CARD_TEMPLATE.format(
+            playlist_name=safe_escape_text(playlist_name),
+            track_count=track_count,
+            playlist_url=playlist_url
+        ))
         
         # Action buttons after success
         col1, col2, col3 = st.columns([1, 1, 1])
@@ -69,13 +106,8 @@ def render_playlist_creation_page(results: List[Dict], oauth_manager) -> Optiona
         with col2:
             if st.button("Convert Another YouTube Playlist", type="primary"):
                 # Clear all state and go back to landing
-                st.session_state.playlist_created = False
-                if 'created_playlist_name' in st.session_state:
-                    del st.session_state.created_playlist_name
-                if 'created_playlist_id' in st.session_state:
-                    del st.session_state.created_playlist_id
-                if 'created_playlist_track_count' in st.session_state:
-                    del st.session_state.created_playlist_track_count
+                for key in ('playlist_created', 'created_playlist_name', 'created_playlist_id', 'created_playlist_track_count'):
+                    st.session_state.pop(key, None)
                 _reset_conversion_state()
                 st.rerun()
         
@@ -83,9 +115,17 @@ def render_playlist_creation_page(results: List[Dict], oauth_manager) -> Optiona
     
     st.markdown("## Create Spotify Playlist")
 
-    # Filter successful matches and failed matches
-    successful_matches = [r for r in results if r.get('found', False)]
-    failed_matches = [r for r in results if not r.get('found', False)]
+    # Partition successful and failed matches in one pass, collecting the
+    # track URIs to add as we go and skipping matches without one
+    successful_matches, failed_matches, valid_track_uris = [], [], []
+    for r in results:
+        if r.get('found', False):
+            successful_matches.append(r)
+            uri = r.get('spotify_uri')
+            if uri:
+                valid_track_uris.append(uri)
+        else:
+            failed_matches.append(r)
     total_songs = len(results)
 
     if not successful_matches:
@@ -100,72 +140,32 @@ def render_playlist_creation_page(results: List[Dict], oauth_manager) -> Optiona
     # Conversion Summary Section
     st.markdown("### Conversion Summary")
     
-    # Create summary statistics with glassmorphism cards
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown(f"""
-        <div style="
-            background: var(--glass-bg);
-            backdrop-filter: var(--glass-backdrop);
-            border: 1px solid var(--glass-border);
-            border-radius: var(--border-radius);
-            padding: 1.5rem;
-            text-align: center;
-            box-shadow: var(--glass-shadow);
-            margin: 0.5rem 0;
-        ">
-            <div style="font-size: 2rem; font-weight: 600; color: var(--text-primary); margin-bottom: 0.5rem;">
-                {total_songs}
-            </div>
-            <div style="color: var(--text-secondary); font-size: 0.9rem; text-transform: uppercase; letter-spacing: 0.5px;">
-                Total Songs
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        success_rate = (len(successful_matches) / total_songs * 100) if total_songs > 0 else 0
-        st.markdown(f"""
-        <div style="
-            background: rgba(76, 175, 80, 0.1);
-            backdrop-filter: var(--glass-backdrop);
-            border: 1px solid rgba(76, 175, 80, 0.3);
-            border-radius: var(--border-radius);
-            padding: 1.5rem;
-            text-align: center;
-            box-shadow: var(--glass-shadow);
-            margin: 0.5rem 0;
-        ">
-            <div style="font-size: 2rem; font-weight: 600; color: #4CAF50; margin-bottom: 0.5rem;">
-                {len(successful_matches)}
-            </div>
-            <div style="color: var(--text-secondary); font-size: 0.9rem; text-transform: uppercase; letter-spacing: 0.5px;">
-                Matched ({success_rate:.1f}%)
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(f"""
-        <div style="
-            background: rgba(255, 68, 68, 0.1);
-            backdrop-filter: var(--glass-backdrop);
-            border: 1px solid rgba(255, 68, 68, 0.3);
-            border-radius: var(--border-radius);
-            padding: 1.5rem;
-            text-align: center;
-            box-shadow: var(--glass-shadow);
-            margin: 0.5rem 0;
-        ">
-            <div style="font-size: 2rem; font-weight: 600; color: #FF4444; margin-bottom: 0.5rem;">
-                {len(failed_matches)}
-            </div>
-            <div style="color: var(--text-secondary); font-size: 0.9rem; text-transform: uppercase; letter-spacing: 0.5px;">
-                Missed
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    # Create summary statistics with glassmorphism cards, laid out by a CSS grid
+    # so all three go to the page as one element
+    success_rate = (len(successful_matches) / total_songs * 100) if total_songs > 0 else 0
+    render_html(_STAT_GRID_TEMPLATE.format(cards="\n".join((
+        _STAT_CARD_TEMPLATE.format(
+            background='var(--glass-bg)',
+            border='var(--glass-border)',
+            color='var(--text-primary)',
+            value=total_songs,
+            label='Total Songs'
+        ),
+        _STAT_CARD_TEMPLATE.format(
+            background='rgba(76, 175, 80, 0.1)',
+            border='rgba(76, 175, 80, 0.3)',
+            color='#4CAF50',
+            value=len(successful_matches),
+            label=f'Matched ({success_rate:.1f}%)'
+        ),
+        _STAT_CARD_TEMPLATE.format(
+            background='rgba(255, 68, 68, 0.1)',
+            border='rgba(255, 68, 68, 0.3)',
+            color='#FF4444',
+            value=len(failed_matches),
+            label='Missed'
+        )
+    ))))
 
     st.markdown(f"**{len(successful_matches)}** songs will be added to your playlist")
 
@@ -218,7 +218,6 @@ def render_playlist_creation_page(results: List[Dict], oauth_manager) -> Optiona
                         return None
 
                     # Create Spotify manager with the access token
-                    from utils.spotify_manager import SpotifyManager
                     spotify_manager = SpotifyManager(
                         Config.SPOTIFY_CLIENT_ID,
                         Config.SPOTIFY_CLIENT_SECRET
@@ -228,16 +227,19 @@ def render_playlist_creation_page(results: List[Dict], oauth_manager) -> Optiona
                     spotify_manager.access_token = access_token
                     spotify_manager.token_type = "authorization_code"  # Required for user operations
 
-                    # Get user info
-                    user_info = spotify_manager.get_user_info()
-                    if not user_info:
-                        st.error("Failed to get user information from Spotify")
-                        return None
-
-                    user_id = user_info.get('id')
+                    # The user id is fixed for the login, so only look it up once
+                    user_id = st.session_state.get('spotify_user_id')
                     if not user_id:
-                        st.error("Could not determine Spotify user ID")
-                        return None
+                        user_info = spotify_manager.get_user_info()
+                        if not user_info:
+                            st.error("Failed to get user information from Spotify")
+                            return None
+
+                        user_id = user_info.get('id')
+                        if not user_id:
+                            st.error("Could not determine Spotify user ID")
+                            return None
+                        st.session_state.spotify_user_id = user_id
 
                     # Set the user_id in the manager
                     spotify_manager.user_id = user_id
@@ -254,10 +256,6 @@ def render_playlist_creation_page(results: List[Dict], oauth_manager) -> Optiona
                         return None
 
                     # Add tracks to playlist
-                    track_uris = [song.get('spotify_uri') for song in successful_matches if song.get('spotify_uri')]
-                    # Filter out any None values
-                    valid_track_uris = [uri for uri in track_uris if uri is not None]
-                    
                     if valid_track_uris:
                         success = spotify_manager.add_tracks_to_playlist(playlist_id, valid_track_uris)
                         if success:
@@ -2,9 +2,22 @@
 Processing Page Components
 """
 import streamlit as st
+import time
+from functools import partial
 from typing import List, Dict, Optional, Callable
 from utils.session import get_session_state, set_session_state
 
+# Most progress redraws per playlist; the final update is always shown
+_MAX_PROGRESS_UPDATES = 50
+
+# Minimum seconds between progress redraws, so fast matching doesn't flood the frontend
+_MIN_PROGRESS_INTERVAL = 0.1
+
+# Progress display text, filled in per update
+_STATUS_TEMPLATE = "**Processing {current} of {total} songs** ({progress:.1%} complete)"
+_CURRENT_SONG_TEMPLATE = "**Currently processing:** {song}"
+_STATS_TEMPLATE = "**{found} found** • **{not_found} not found**"
+
 def render_processing_page(processor) -> Optional[List[Dict]]:
     """Render enhanced processing page with detailed progress tracking"""
 
@@ -26,15 +39,18 @@ def render_processing_page(processor) -> Optional[List[Dict]]:
     # Start processing
     if 'processing_started' not in st.session_state:
         st.session_state.processing_started = True
-        st.session_state.conversion_stats = {'found': 0, 'not_found': 0, 'total': 0}
+        stats = {'found': 0, 'not_found': 0, 'total': 0}
+        st.session_state.conversion_stats = stats
 
         try:
             # Use pre-parsed playlist data for processing
             youtube_url = get_session_state('youtube_url', '')
             results = processor.process_playlist_with_data(
                 playlist_data,
-                progress_callback=lambda current, total, song: _update_enhanced_progress(
-                    progress_bar, status_text, current_song, stats_container, current, total, song
+                # Display slots and the stats dict are bound once rather than looked up per song;
+                # the redraw timestamp is per run, so sessions don't throttle each other
+                progress_callback=partial(
+                    _update_enhanced_progress, progress_bar, status_text, current_song, stats_container, stats, [0.0]
                 )
             )
 
@@ -47,24 +63,30 @@ def render_processing_page(processor) -> Optional[List[Dict]]:
             col1, col2, col3 = st.columns([1, 2, 1])
             with col2:
                 if st.button("Try Again"):
-                    if 'processing_started' in st.session_state:
-                        del st.session_state.processing_started
+                    st.session_state.pop('processing_started', None)
                     st.rerun()
 
     return None
 
-def _update_enhanced_progress(progress_bar, status_text, current_song, stats_container, current: int, total: int, song: str):
+def _update_enhanced_progress(progress_bar, status_text, current_song, stats_container, stats: Dict[str, int],
+                              last_update: List[float], current: int, total: int, song: str):
     """Update enhanced progress display"""
+    # Redraw in steps of ~2%, at most every 100ms, so long playlists don't flood the frontend
+    now = time.monotonic()
+    if current < total and (current % max(1, total // _MAX_PROGRESS_UPDATES)
+                            or now - last_update[0] < _MIN_PROGRESS_INTERVAL):
+        return
+    last_update[0] = now
+
     # Update progress bar
     progress = current / total if total > 0 else 0
     progress_bar.progress(progress)
 
     # Update status
-    status_text.markdown(f"**Processing {current} of {total} songs** ({progress:.1%} complete)")
+    status_text.markdown(_STATUS_TEMPLATE.format(current=current, total=total, progress=progress))
 
     # Update current song
-    current_song.markdown(f"**Currently processing:** {song}")
+    current_song.markdown(_CURRENT_SONG_TEMPLATE.format(song=song))
 
     # Update stats
-    stats = get_session_state('conversion_stats', {'found': 0, 'not_found': 0, 'total': current})
-    stats_container.markdown(f"**{stats['found']} found** • **{stats['not_found']} not found**")
\ No newline at end of file
+    stats_container.markdown(_STATS_TEMPLATE.format(**stats))
@@ -2,8 +2,33 @@
 Shared UI Utilities and Helpers
 """
 import streamlit as st
+from bisect import bisect_right
 from typing import Any, Optional
 
+# HTML special characters, escaped in a single pass with str.translate
+_HTML_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;'
+})
+
+# Confidence score lower bounds for the medium and high CSS classes
+_CONFIDENCE_THRESHOLDS = (0.5, 0.8)
+_CONFIDENCE_CLASSES = ('low', 'medium', 'high')
+
+# st.html (Streamlit 1.33+) sends HTML straight to the page without markdown parsing
+_HAS_ST_HTML = hasattr(st, 'html')
+
+def render_html(markup: str, container=None):
+    """Render raw HTML, bypassing the markdown parser when st.html is available"""
+    target = container if container is not None else st
+    if _HAS_ST_HTML:
+        target.html(markup)
+    else:
+        target.markdown(markup, unsafe_allow_html=True)
+
 def render_spotify_icon():
     """Render a Spotify icon"""
     return '<div class="spotify-icon"></div>'
@@ -16,7 +41,7 @@ def safe_escape_text(text: str) -> str:
     """Safely escape text for HTML rendering"""
     if not text:
         return ""
-    return text.replace('"', '"').replace('<', '<').replace('>', '>')
+    return text.translate(_HTML_ESCAPE)
 
 def create_styled_container(styles: dict, content: str) -> str:
     """Create a styled HTML container with the given styles and content"""
@@ -58,9 +83,4 @@ def format_confidence_score(confidence: float) -> str:
 
 def get_confidence_class(confidence: float) -> str:
     """Get CSS class based on confidence score"""
-    if confidence >= 0.8:
-        return "high"
-    elif confidence >= 0.5:
-        return "medium"
-    else:
-        return "low"
\ No newline at end of file
+    return _CONFIDENCE_CLASSES[bisect_right(_CONFIDENCE_THRESHOLDS, confidence)]
\ No newline at end of file
@@ -6,6 +6,7 @@ Follows OAuth 2.0 RFC 6749 best practices for state management
 import streamlit as st
 import time
 import logging
+import requests
 from typing import Optional, Dict, Any
 from config import Config
 from .oauth_state_manager import get_state_manager
@@ -22,7 +23,7 @@ class ProperOAuthManager:
         
     def is_authenticated(self) -> bool:
         """Check if user is authenticated"""
-        return 'spotify_token' in st.session_state and st.session_state.spotify_token is not None
+        return st.session_state.get('spotify_token') is not None
     
     def get_auth_url(self, state_data: Optional[Dict] = None) -> str:
         """Generate Spotify authorization URL with file-based state persistence"""
@@ -61,8 +62,6 @@ class ProperOAuthManager:
     def handle_oauth_callback(self, auth_code: str, state_param: Optional[str] = None) -> bool:
         """Handle OAuth callback and exchange code for token with file-based state restoration"""
         try:
-            import requests
-            
             # Exchange code for token
             token_url = "https://accounts.spotify.com/api/token"
             
@@ -80,6 +79,8 @@ class ProperOAuthManager:
                 token_data = response.json()
                 st.session_state.spotify_token = token_data
                 st.session_state.spotify_authenticated = True
+                # A new login may be a different account
+                st.session_state.pop('spotify_user_id', None)
                 
                 # Restore state data from file using state token
                 if state_param:
@@ -201,7 +202,7 @@ class ProperOAuthManager:
     
     def clear_authentication(self):
         """Clear authentication data"""
-        keys_to_clear = ['spotify_token', 'spotify_authenticated']
+        keys_to_clear = ['spotify_token', 'spotify_authenticated', 'spotify_user_id', 'playlist_processor']
         for key in keys_to_clear:
             if key in st.session_state:
                 del st.session_state[key]
\ No newline at end of file
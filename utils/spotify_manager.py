@@ -8,10 +8,34 @@ import time
 import logging
 from typing import List, Dict, Optional, Callable
 import requests
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from urllib.parse import quote
+from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Longest we wait on a single rate-limit response before retrying; a longer
+# Retry-After means the limit is still active, so the request gives up instead
+MAX_RETRY_WAIT_S = 30
+
+def _retry_after_seconds(header: Optional[str], default: float) -> float:
+    """Seconds to wait from a Retry-After header, given as delta-seconds or an HTTP date"""
+    if not header:
+        return default
+    try:
+        return max(0.0, float(header))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
 class SpotifyManager:
     """Handles Spotify Web API operations"""
 
@@ -21,7 +45,6 @@ class SpotifyManager:
         self.client_secret = client_secret
         self.user_id = user_id
         # Use provided redirect_uri or fall back to Config value
-        from config import Config
         self.redirect_uri = redirect_uri or Config.SPOTIFY_REDIRECT_URI
         self.access_token = None
         self.token_type = None  # 'authorization_code' or 'client_credentials'
@@ -142,8 +165,12 @@ class SpotifyManager:
                 response = requests.request(method, url, headers=headers, **kwargs)
                 
                 if response.status_code == 429:  # Rate limited
-                    retry_after = int(response.headers.get('Retry-After', 1))
-                    logger.warning(f"Rate limited, waiting {retry_after} seconds")
+                    # Honour Retry-After, backing off exponentially when it is missing; retrying
+                    # before the limit lifts would only waste the remaining attempts
+                    retry_after = _retry_after_seconds(response.headers.get('Retry-After'), 2 ** attempt)
+                    if retry_after > MAX_RETRY_WAIT_S or attempt == 2:
+                        raise RateLimitError(f"Spotify rate limit active, retry after {retry_after:.0f} seconds")
+                    logger.warning(f"Rate limited, waiting {retry_after:.0f} seconds")
                     time.sleep(retry_after)
                     continue
                 
@@ -203,7 +230,10 @@ class SpotifyManager:
         }
         
         data = self._make_request('GET', 'search', params=params)
-        if not data or 'tracks' not in data:
+        if data is None:
+            # A failed request must not look like a search that found nothing
+            raise SpotifyError(f"Spotify search failed for query: {query}")
+        if 'tracks' not in data:
             return None
         
         tracks = data['tracks']['items']
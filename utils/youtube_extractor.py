@@ -4,32 +4,47 @@ Optimized for web application use with better error handling and progress tracki
 """
 
 import re
-import time
 import logging
 from typing import List, Dict, Optional, Callable
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Playlist ID from any URL carrying a list= parameter (playlist, watch and youtu.be links)
+_PLAYLIST_ID_RE = re.compile(r'list=([a-zA-Z0-9_-]+)')
+
+# (connect, read) timeout in seconds for YouTube API requests
+_REQUEST_TIMEOUT = (3, 10)
+
+# Transient failures are retried with backoff, honouring Retry-After
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# Playlist thumbnail sizes, best first
+_THUMBNAIL_QUALITIES = ('maxres', 'standard', 'high', 'medium', 'default')
+
 class YouTubeExtractor:
     """Handles YouTube playlist extraction using YouTube Data API v3"""
     
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://www.googleapis.com/youtube/v3"
+
+        # Reuse connections across the many paginated requests
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_RETRY))
         
     def extract_playlist_id(self, url: str) -> Optional[str]:
         """Extract playlist ID from various YouTube URL formats"""
-        patterns = [
-            r'list=([a-zA-Z0-9_-]+)',
-            r'playlist\?list=([a-zA-Z0-9_-]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        return None
+        match = _PLAYLIST_ID_RE.search(url)
+        return match.group(1) if match else None
     
     def validate_url(self, url: str) -> bool:
         """Validate if the URL is a valid YouTube playlist URL"""
@@ -49,25 +64,29 @@ class YouTubeExtractor:
         return playlist_id is not None
     
     def get_playlist_info(self, playlist_id: str) -> Optional[Dict[str, str]]:
-        """Get basic playlist information"""
+        """Get basic playlist information, including its best available thumbnail"""
         params = {
             'part': 'snippet',
             'id': playlist_id,
+            'fields': 'items(snippet(title,description,channelTitle,publishedAt,thumbnails))',
             'key': self.api_key
         }
         
         try:
-            response = requests.get(f"{self.base_url}/playlists", params=params)
+            response = self.session.get(f"{self.base_url}/playlists", params=params, timeout=_REQUEST_TIMEOUT)
             response.raise_for_status()
             data = response.json()
             
             if data.get('items'):
                 item = data['items'][0]
+                thumbnails = item['snippet'].get('thumbnails', {})
+                thumbnail = next((thumbnails[q]['url'] for q in _THUMBNAIL_QUALITIES if q in thumbnails), None)
                 return {
                     'title': item['snippet']['title'],
                     'description': item['snippet']['description'],
                     'channel': item['snippet']['channelTitle'],
-                    'published': item['snippet']['publishedAt']
+                    'published': item['snippet']['publishedAt'],
+                    'thumbnail': thumbnail
                 }
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching playlist info: {e}")
@@ -89,9 +108,7 @@ class YouTubeExtractor:
         videos = []
         next_page_token = None
         total_processed = 0
-        
-        # First, get the total count for progress tracking
-        total_videos = self._get_playlist_video_count(playlist_id)
+        total_videos = None
         
         while True:
             params = {
@@ -105,67 +122,52 @@ class YouTubeExtractor:
                 params['pageToken'] = next_page_token
 
             try:
-                response = requests.get(f"{self.base_url}/playlistItems", params=params)
+                response = self.session.get(f"{self.base_url}/playlistItems", params=params, timeout=_REQUEST_TIMEOUT)
                 response.raise_for_status()
                 data = response.json()
-
-                for item in data.get('items', []):
-                    title = item['snippet']['title']
-                    channel_name = item['snippet'].get('videoOwnerChannelTitle', '').replace(' - Topic', '')
-
-                    if title not in ["Deleted video", "Private video"]:
-                        videos.append({
-                            'title': title,
-                            'channel': channel_name,
-                            'video_id': item['snippet']['resourceId']['videoId'],
-                            'published': item['snippet']['publishedAt']
-                        })
-                    
-                    total_processed += 1
-                    
-                    # Report progress if callback provided
-                    if progress_callback:
-                        progress_callback(total_processed, total_videos or total_processed)
-
-                next_page_token = data.get('nextPageToken')
-                if not next_page_token:
-                    break
-
-                # Rate limiting - YouTube allows 100 requests per 100 seconds
-                time.sleep(1)
-
             except requests.exceptions.RequestException as e:
                 logger.error(f"Error fetching playlist videos: {e}")
-                if "quotaExceeded" in str(e):
-                    raise Exception("YouTube API quota exceeded. Please try again later.")
-                elif "playlistNotFound" in str(e):
-                    raise Exception("Playlist not found or is private.")
+                # The error reason is in the response body, not the exception message
+                status = e.response.status_code if e.response is not None else None
+                body = e.response.text if e.response is not None else ''
+                if status == 429 or "quotaExceeded" in body:
+                    raise QuotaExceededError("YouTube API quota exceeded. Please try again later.") from e
+                elif status == 404 or "playlistNotFound" in body:
+                    raise PlaylistNotFoundError("Playlist not found or is private.") from e
                 else:
-                    raise Exception(f"Error accessing YouTube API: {str(e)}")
+                    raise YouTubeError(f"Error accessing YouTube API: {str(e)}") from e
+
+            # Every page carries the playlist size, so no separate count request is needed
+            if total_videos is None:
+                total_videos = data.get('pageInfo', {}).get('totalResults')
+
+            for item in data.get('items', []):
+                title = item['snippet']['title']
+                channel_name = item['snippet'].get('videoOwnerChannelTitle', '').replace(' - Topic', '')
+
+                if title not in ["Deleted video", "Private video"]:
+                    videos.append({
+                        'title': title,
+                        'channel': channel_name,
+                        'video_id': item['snippet']['resourceId']['videoId'],
+                        'published': item['snippet']['publishedAt']
+                    })
+                
+                total_processed += 1
+                
+                # Report progress if callback provided
+                if progress_callback:
+                    progress_callback(total_processed, total_videos or total_processed)
+
+            # Quota is counted per request, not per second, and 429s are retried
+            # with backoff by the session, so the next page is fetched right away
+            next_page_token = data.get('nextPageToken')
+            if not next_page_token:
+                break
 
         logger.info(f"Extracted {len(videos)} videos from YouTube playlist")
         return videos
     
-    def _get_playlist_video_count(self, playlist_id: str) -> Optional[int]:
-        """Get the total number of videos in a playlist for progress tracking"""
-        try:
-            params = {
-                'part': 'contentDetails',
-                'id': playlist_id,
-                'key': self.api_key
-            }
-            
-            response = requests.get(f"{self.base_url}/playlists", params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('items'):
-                return data['items'][0]['contentDetails']['itemCount']
-        except Exception as e:
-            logger.warning(f"Could not get playlist video count: {e}")
-        
-        return None
-    
     def test_api_key(self) -> bool:
         """Test if the API key is valid"""
         try:
@@ -176,7 +178,7 @@ class YouTubeExtractor:
                 'key': self.api_key
             }
             
-            response = requests.get(f"{self.base_url}/videos", params=params)
+            response = self.session.get(f"{self.base_url}/videos", params=params, timeout=_REQUEST_TIMEOUT)
             response.raise_for_status()
             return True
         except requests.exceptions.RequestException: